@@ -3,8 +3,10 @@ Entry point for running DataForge as a module.
 Usage: python -m dataforge [arguments]
 """
 
+import sys
+
 from dataforge.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
@@ -3,17 +3,32 @@ CLI Interface Module
 Handles command line argument parsing and main program flow.
 """
 
-import argparse
+import os
 import sys
 import json
+import logging
+from types import SimpleNamespace
 from dataforge.logger import setup_logger, log_start, log_completion
 from dataforge.config import load_default_config, merge_config_with_args
-from dataforge.utils import load_schema
-from dataforge.validator import validate_all_parameters
-from dataforge.schema_parser import parse_schema
-from dataforge.data_generator import create_generator
-from dataforge.file_manager import create_multiple_files, clear_directory, write_to_console
-from dataforge.multiprocessor import generate_files_parallel, should_use_multiprocessing
+
+
+# Valid values for --file_prefix
+FILE_PREFIX_CHOICES = ['count', 'random', 'uuid']
+
+# Options understood by the fast argument parser: option -> converter
+# (None marks a boolean flag)
+FAST_PARSE_OPTIONS = {
+    '--files_count': int,
+    '--file_name': str,
+    '--file_prefix': str,
+    '--data_schema': str,
+    '--data_lines': int,
+    '--clear_path': None,
+    '--multiprocessing': int,
+}
+
+# Longest schema text shown by display_parameters() before truncating
+SCHEMA_PREVIEW_LENGTH = 100
 
 
 def create_parser():
@@ -23,6 +38,9 @@ def create_parser():
     Returns:
         argparse.ArgumentParser: Configured argument parser
     """
+    # Imported here: the common path is handled by fast_parse_arguments()
+    import argparse
+    
     parser = argparse.ArgumentParser(
         prog='dataforge',
         description='DataForge - Test Data Generation Utility\n'
@@ -67,7 +85,7 @@ Examples:
     parser.add_argument(
         '--file_prefix',
         type=str,
-        choices=['count', 'random', 'uuid'],
+        choices=FILE_PREFIX_CHOICES,
         help='Prefix strategy for file names: count (sequential), random (random numbers), uuid (unique IDs)'
     )
     
@@ -105,13 +123,104 @@ def parse_arguments(args=None):
     Args:
         args (list, optional): Arguments to parse. If None, uses sys.argv
     
+    Well-formed command lines are handled by fast_parse_arguments();
+    anything else (--help, errors, abbreviations) goes through argparse.
+    
     Returns:
         argparse.Namespace: Parsed arguments
     """
+    if args is None:
+        args = sys.argv[1:]
+    
+    namespace = fast_parse_arguments(args)
+    if namespace is not None:
+        return namespace
+    
     parser = create_parser()
     return parser.parse_args(args)
 
 
+def fast_parse_arguments(args):
+    """
+    Parse a plain command line without building an argparse parser.
+    
+    Only the known options in '--key value' or '--key=value' form plus a
+    single positional path are recognized. Anything else, including
+    values argparse would reject, makes this return None so the caller
+    can fall back to argparse for proper help and error messages.
+    
+    Args:
+        args (list): Arguments to parse (without program name)
+    
+    Returns:
+        types.SimpleNamespace or None: Parsed arguments with the same
+            attributes as argparse would produce, or None
+    
+    Example:
+        >>> fast_parse_arguments(['.', '--files_count=3']).files_count
+        3
+        >>> fast_parse_arguments(['--help']) is None
+        True
+    """
+    values = {
+        'path_to_save_files': None,
+        'files_count': None,
+        'file_name': None,
+        'file_prefix': None,
+        'data_schema': None,
+        'data_lines': None,
+        'clear_path': False,
+        'multiprocessing': None,
+    }
+    
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        i += 1
+        
+        if not arg.startswith('-'):
+            # Positional path (only one allowed)
+            if values['path_to_save_files'] is not None:
+                return None
+            values['path_to_save_files'] = arg
+            continue
+        
+        option, has_value, value = arg.partition('=')
+        if option not in FAST_PARSE_OPTIONS:
+            return None
+        
+        convert = FAST_PARSE_OPTIONS[option]
+        
+        if convert is None:
+            # Boolean flag takes no value
+            if has_value:
+                return None
+            values[option[2:]] = True
+            continue
+        
+        if not has_value:
+            # Value in next argument; leave dash-prefixed values to argparse
+            if i >= len(args) or args[i].startswith('-'):
+                return None
+            value = args[i]
+            i += 1
+        
+        try:
+            value = convert(value)
+        except ValueError:
+            return None
+        
+        if option == '--file_prefix' and value not in FILE_PREFIX_CHOICES:
+            return None
+        
+        values[option[2:]] = value
+    
+    if values['path_to_save_files'] is None:
+        return None
+    
+    return SimpleNamespace(**values)
+
+
 def display_parameters(logger, params):
     """
     Display current parameters configuration.
@@ -120,6 +229,11 @@ def display_parameters(logger, params):
         logger: Logger instance
         params (dict): Parameters dictionary
     """
+    # Nothing below is shown above INFO level, so skip building the
+    # messages (including the schema serialization) altogether
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     logger.info("Current configuration:")
     logger.info(f"  Path to save files: {params['path_to_save_files']}")
     logger.info(f"  Files count: {params['files_count']}")
@@ -131,15 +245,12 @@ def display_parameters(logger, params):
     
     if params['data_schema']:
         # Convert dict to string for display
-        import json
         schema_str = json.dumps(params['data_schema'])
-        schema_preview = schema_str[:100]
-        if len(schema_str) > 100:
-            schema_preview += "..."
-        logger.info(f"  Data schema: {schema_preview}")
+        ellipsis = "..." if len(schema_str) > SCHEMA_PREVIEW_LENGTH else ""
+        logger.info(f"  Data schema: {schema_str[:SCHEMA_PREVIEW_LENGTH]}{ellipsis}")
 
 
-def main():
+def main(argv=None):
     """
     Main entry point for the application.
     
@@ -150,6 +261,17 @@ def main():
     4. Merges configuration with arguments (CLI has priority)
     5. Validates parameters
     6. Executes data generation (to be implemented in later stages)
+    
+    Args:
+        argv (list, optional): Command line arguments (without program
+            name). If None, uses sys.argv
+    
+    Returns:
+        int: Exit code (0 on success; errors exit via sys.exit())
+    
+    Example:
+        >>> main(['.', '--files_count=0', '--data_lines=1'])
+        0
     """
     # Setup logger
     logger = setup_logger()
@@ -164,7 +286,17 @@ def main():
         
         # Parse command line arguments
         logger.info("Parsing command line arguments...")
-        args = parse_arguments()
+        args = parse_arguments(argv)
+        
+        # Generation modules (and multiprocessing, uuid, re behind them) are
+        # imported only after argparse is done, so --help and argument
+        # errors exit without paying for them
+        from dataforge.utils import load_schema
+        from dataforge.validator import validate_all_parameters
+        from dataforge.schema_parser import parse_schema
+        from dataforge.data_generator import create_generator
+        from dataforge.file_manager import create_multiple_files, clear_directory, write_to_console
+        from dataforge.multiprocessor import generate_files_parallel, should_use_multiprocessing
         
         # Merge configuration with CLI arguments (CLI has priority)
         logger.info("Merging configuration with command line arguments...")
@@ -194,12 +326,12 @@ def main():
         logger.info("Starting data generation...")
         logger.info("=" * 60)
         
-        generator = create_generator(params['parsed_schema'])
-        logger.info(f"Generator initialized for {len(params['parsed_schema'])} field(s)")
-        
         # Generate data
         if params['files_count'] == 0:
             # Console output mode
+            generator = create_generator(params['parsed_schema'])
+            logger.info(f"Generator initialized for {len(params['parsed_schema'])} field(s)")
+            
             logger.info("Mode: Console output")
             logger.info(f"Generating {params['data_lines']} line(s)...")
             
@@ -253,6 +385,9 @@ def main():
                 created_files = generate_files_parallel(parallel_params)
             else:
                 logger.info("Creating files (single process mode)...")
+                generator = create_generator(params['parsed_schema'])
+                logger.info(f"Generator initialized for {len(params['parsed_schema'])} field(s)")
+                
                 created_files = create_multiple_files(
                     path=params['path_to_save_files'],
                     file_name=params['file_name'],
@@ -267,7 +402,6 @@ def main():
             
             # Show first 5 files
             for i, filepath in enumerate(created_files[:5], 1):
-                import os
                 filename = os.path.basename(filepath)
                 logger.info(f"  {i}. {filename}")
             
@@ -283,6 +417,8 @@ def main():
         logger.info("Data generation completed successfully")
         logger.info("=" * 60)
         
+        return 0
+        
     except KeyboardInterrupt:
         logger.warning("\nOperation interrupted by user (Ctrl+C)")
         sys.exit(130)
@@ -293,4 +429,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -9,12 +9,38 @@ them to other parts of the application.
 import configparser
 import os
 import json
+from collections.abc import Mapping
 from dataforge.logger import get_logger
 
 
 # Default configuration file name
 DEFAULT_CONFIG_FILE = 'default.ini'
 
+# Built-in configuration, used when default.ini is missing and when
+# creating a new one
+HARDCODED_DEFAULTS = {
+    'DEFAULT': {
+        'files_count': '10',
+        'file_name': 'generated_data',
+        'file_prefix': 'count',
+        'data_lines': '1000',
+        'multiprocessing': '1'
+    },
+    'SCHEMA': {
+        'default_schema': '{"id": "int:rand", "timestamp": "timestamp:", "value": "str:rand"}'
+    }
+}
+
+# Parameters a command line value overrides when it is not None
+CLI_OVERRIDE_KEYS = (
+    'files_count',
+    'file_name',
+    'file_prefix',
+    'data_lines',
+    'multiprocessing',
+    'data_schema'
+)
+
 
 def load_default_config(config_file=None):
     """
@@ -66,17 +92,7 @@ def get_hardcoded_defaults():
     """
     config = configparser.ConfigParser()
     
-    config['DEFAULT'] = {
-        'files_count': '10',
-        'file_name': 'generated_data',
-        'file_prefix': 'count',
-        'data_lines': '1000',
-        'multiprocessing': '1'
-    }
-    
-    config['SCHEMA'] = {
-        'default_schema': '{"id": "int:rand", "timestamp": "timestamp:", "value": "str:rand"}'
-    }
+    config.read_dict(HARDCODED_DEFAULTS)
     
     return config
 
@@ -117,8 +133,9 @@ def get_config_int(config, section, key, fallback=0):
     Returns:
         int: Configuration value or fallback
     """
+    # int(get()) is what getint() does, minus its converter dispatch
     try:
-        return config.getint(section, key)
+        return int(config.get(section, key))
     except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
         return fallback
 
@@ -151,17 +168,7 @@ def create_default_config(config_file=None):
     # Create default configuration
     config = configparser.ConfigParser()
     
-    config['DEFAULT'] = {
-        'files_count': '10',
-        'file_name': 'generated_data',
-        'file_prefix': 'count',
-        'data_lines': '1000',
-        'multiprocessing': '1'
-    }
-    
-    config['SCHEMA'] = {
-        'default_schema': '{"id": "int:rand", "timestamp": "timestamp:", "value": "str:rand"}'
-    }
+    config.read_dict(HARDCODED_DEFAULTS)
     
     # Write to file
     try:
@@ -185,7 +192,8 @@ def merge_config_with_args(config, args):
     
     Args:
         config (configparser.ConfigParser): Configuration object
-        args (argparse.Namespace): Parsed command line arguments
+        args (argparse.Namespace or Mapping): Parsed command line arguments,
+            or a plain dict of the same values
     
     Returns:
         dict: Merged configuration as dictionary
@@ -194,36 +202,27 @@ def merge_config_with_args(config, args):
         >>> config = load_default_config()
         >>> args = parser.parse_args()
         >>> params = merge_config_with_args(config, args)
+        >>> merge_config_with_args(config, {'path_to_save_files': '/tmp', 'clear_path': False})['files_count']
+        10
     """
+    options = args if isinstance(args, Mapping) else vars(args)
+    
     # Start with config values
     params = {
-        'path_to_save_files': args.path_to_save_files,
+        'path_to_save_files': options['path_to_save_files'],
         'files_count': get_config_int(config, 'DEFAULT', 'files_count', 10),
         'file_name': get_config_value(config, 'DEFAULT', 'file_name', 'generated_data'),
         'file_prefix': get_config_value(config, 'DEFAULT', 'file_prefix', 'count'),
         'data_lines': get_config_int(config, 'DEFAULT', 'data_lines', 1000),
         'multiprocessing': get_config_int(config, 'DEFAULT', 'multiprocessing', 1),
-        'clear_path': args.clear_path,
+        'clear_path': options.get('clear_path', False),
         'data_schema': get_config_value(config, 'SCHEMA', 'default_schema', None)
     }
     
     # Override with command line arguments if provided
-    if args.files_count is not None:
-        params['files_count'] = args.files_count
-    
-    if args.file_name is not None:
-        params['file_name'] = args.file_name
-    
-    if args.file_prefix is not None:
-        params['file_prefix'] = args.file_prefix
-    
-    if args.data_lines is not None:
-        params['data_lines'] = args.data_lines
-    
-    if args.multiprocessing is not None:
-        params['multiprocessing'] = args.multiprocessing
-    
-    if args.data_schema is not None:
-        params['data_schema'] = args.data_schema
+    for key in CLI_OVERRIDE_KEYS:
+        value = options.get(key)
+        if value is not None:
+            params[key] = value
     
     return params
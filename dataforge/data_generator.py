@@ -6,12 +6,28 @@ This module takes a parsed schema and generates random data according to
 the specified types and strategies.
 """
 
+import os
 import random
 import string
+import sys
 import time
 import json
-import uuid
 from dataforge.logger import get_logger
+from dataforge.utils import encode_json_line
+
+
+# Default number of rows per batch for streaming generation
+STREAM_BATCH_SIZE = 4096
+
+# Widest int span drawn in bulk via random.choices(); it maps a float in
+# [0, 1) onto the range, which stays effectively uniform well below 2**53
+MAX_BULK_INT_SPAN = 2 ** 32
+
+# Random number generator behind the module-level generate_* helpers;
+# reseeded in forked children so worker processes don't repeat values
+_RNG = random.Random()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_RNG.seed)
 
 
 class DataGenerator:
@@ -21,10 +37,14 @@ class DataGenerator:
     Generates test data based on parsed schema.
     """
     
-    def __init__(self, parsed_schema):
+    def __init__(self, parsed_schema, seed=None):
         """
         Initialize generator with parsed schema.
         
+        Each generator owns its random number generator, so generators in
+        different processes or threads never share state, and passing a
+        seed makes the generated values reproducible (except timestamps).
+        
         Args:
             parsed_schema (dict): Parsed schema from SchemaParser
                 Format: {
@@ -34,6 +54,8 @@ class DataGenerator:
                         'value': None | list | (min, max) | static_value
                     }
                 }
+            seed (int, optional): Seed for this generator's random number
+                generator. If None, it is seeded from system entropy.
         
         Example:
             >>> schema = {
@@ -41,9 +63,40 @@ class DataGenerator:
             ...     'name': {'type': 'str', 'strategy': 'rand', 'value': None}
             ... }
             >>> generator = DataGenerator(schema)
+            >>> DataGenerator(schema, seed=42).generate_line() == DataGenerator(schema, seed=42).generate_line()
+            True
         """
         self.logger = get_logger()
         self.parsed_schema = parsed_schema
+        self._rng = random.Random(seed)
+        
+        # Compile schema once into (field_name, zero-arg callable) pairs
+        # so the per-row loop does no type/strategy dispatch, plus column
+        # generators for batch mode that produce `count` values at once
+        # (structure-of-arrays)
+        fields = []
+        columns = []
+        encoders = []
+        for field_name, field_config in parsed_schema.items():
+            generate = self._compile_field(field_config)
+            fields.append((field_name, generate))
+            columns.append((field_name, self._compile_column(field_config, generate)))
+            encoders.append(COLUMN_ENCODERS.get(dispatch_key(field_config), encode_json_line))
+        
+        # Frozen: the compiled plan never changes after construction
+        self._fields = tuple(fields)
+        self._build_line = compile_line_builder(self._fields)
+        self._columns = tuple(columns)
+        self._column_names = tuple(field_name for field_name, _ in columns)
+        self._column_encoders = tuple(encoders)
+        
+        # JSON object template with one %s per field, in schema order, so
+        # encoded columns can be laid out into lines without building dicts
+        self._line_template = '{' + ','.join(
+            encode_json_line(field_name).replace('%', '%%') + ':%s'
+            for field_name in self._column_names
+        ) + '}\n'
+        
         self.logger.debug(f"DataGenerator initialized with {len(parsed_schema)} field(s)")
     
     def generate_line(self):
@@ -57,18 +110,16 @@ class DataGenerator:
             >>> generator.generate_line()
             {'id': 12345, 'name': 'a1b2c3d4', 'timestamp': 1706543210.123}
         """
-        line = {}
-        
-        for field_name, field_config in self.parsed_schema.items():
-            value = self._generate_field_value(field_config)
-            line[field_name] = value
-        
-        return line
+        return self._build_line()
     
     def generate_lines(self, count):
         """
         Generate multiple lines of data.
         
+        Values are generated column by column (one call per field instead
+        of one call per field per row) and zipped into row dicts at the end.
+        Timestamp fields share a single clock reading per call.
+        
         Args:
             count (int): Number of lines to generate
         
@@ -80,14 +131,104 @@ class DataGenerator:
             >>> len(lines)
             10
         """
-        self.logger.debug(f"Generating {count} line(s) of data")
+        # Called once per batch when streaming; let logging format lazily
+        self.logger.debug("Generating %d line(s) of data", count)
+        
+        if not self._columns:
+            return [{} for _ in range(count)]
+        
+        columns = self.generate_columns(count)
+        
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    
+    def generate_columns(self, count):
+        """
+        Generate multiple lines of data as columns.
+        
+        Args:
+            count (int): Number of lines to generate
+        
+        Returns:
+            dict: Field name -> list of `count` values, in schema order
+        
+        Example:
+            >>> generator.generate_columns(3)
+            {'id': [12345, 42, 7], 'name': ['a1b2c3d4', '0f9e8d7c', '11223344']}
+        """
+        return {field_name: generate_column(count) for field_name, generate_column in self._columns}
+    
+    def generate_lines_encoded(self, count):
+        """
+        Generate multiple lines of data as encoded JSON Lines.
+        
+        Each column is encoded in one pass and laid out into lines with a
+        precompiled template, so no per-row dict is built or serialized.
+        The output is identical to encoding generate_lines() rows with
+        encode_json_line().
+        
+        Args:
+            count (int): Number of lines to generate
+        
+        Returns:
+            list[bytes]: UTF-8 JSON lines, each ending with a newline
+        
+        Example:
+            >>> generator.generate_lines_encoded(2)
+            [b'{"id":12345}\\n', b'{"id":42}\\n']
+        """
+        if not self._columns:
+            return [b'{}\n'] * count
         
-        lines = []
-        for _ in range(count):
-            line = self.generate_line()
-            lines.append(line)
+        template = self._line_template
+        encoded_columns = [
+            list(map(encode, generate_column(count)))
+            for encode, (_, generate_column) in zip(self._column_encoders, self._columns)
+        ]
         
-        return lines
+        return [(template % row).encode('utf-8') for row in zip(*encoded_columns)]
+    
+    def iter_batches(self, count, batch_size=STREAM_BATCH_SIZE):
+        """
+        Generate lines of data in batches.
+        
+        Yields lists of at most `batch_size` lines until `count` lines
+        have been produced, so callers can stream large outputs without
+        holding every line in memory at once.
+        
+        Args:
+            count (int): Total number of lines to generate
+            batch_size (int): Maximum number of lines per batch
+        
+        Yields:
+            list: Batch of generated data lines
+        
+        Example:
+            >>> [len(batch) for batch in generator.iter_batches(10, batch_size=4)]
+            [4, 4, 2]
+        """
+        for start in range(0, count, batch_size):
+            yield self.generate_lines(min(batch_size, count - start))
+    
+    def iter_encoded_batches(self, count, batch_size=STREAM_BATCH_SIZE):
+        """
+        Generate encoded JSON Lines in batches.
+        
+        Like iter_batches(), but yields the output of
+        generate_lines_encoded(), ready to be written to a file.
+        
+        Args:
+            count (int): Total number of lines to generate
+            batch_size (int): Maximum number of lines per batch
+        
+        Yields:
+            list[bytes]: Batch of UTF-8 JSON lines
+        
+        Example:
+            >>> [len(batch) for batch in generator.iter_encoded_batches(10, batch_size=4)]
+            [4, 4, 2]
+        """
+        for start in range(0, count, batch_size):
+            yield self.generate_lines_encoded(min(batch_size, count - start))
     
     def generate_line_json(self):
         """
@@ -98,15 +239,76 @@ class DataGenerator:
         
         Example:
             >>> generator.generate_line_json()
-            '{"id": 12345, "name": "test"}'
+            '{"id":12345,"name":"test"}'
         """
         line = self.generate_line()
-        return json.dumps(line)
+        return encode_json_line(line)
+    
+    def _compile_field(self, field_config):
+        """
+        Compile a single field config into a zero-arg value generator.
+        
+        Dispatch on type/strategy happens here, once per field, instead of
+        once per generated value: a single lookup in FIELD_GENERATORS.
+        
+        Args:
+            field_config (dict): Field configuration from parsed schema
+        
+        Returns:
+            callable: Function taking no arguments and returning a value
+        
+        Example:
+            >>> config = {'type': 'int', 'strategy': 'range', 'value': (1, 10)}
+            >>> generate = generator._compile_field(config)
+            >>> 1 <= generate() <= 10
+            True
+        """
+        make_generator = FIELD_GENERATORS.get(dispatch_key(field_config))
+        
+        # Fallback (should not happen with validated schema)
+        if make_generator is None:
+            self.logger.warning(f"Unknown field type/strategy: {field_config['type']}/{field_config['strategy']}")
+            return lambda: None
+        
+        return make_generator(intern_value(field_config['value']), self._rng)
+    
+    def _compile_column(self, field_config, generate):
+        """
+        Compile a single field config into a batch column generator.
+        
+        Uses COLUMN_GENERATORS when the field has a batch form, otherwise
+        wraps the per-value generator.
+        
+        Args:
+            field_config (dict): Field configuration from parsed schema
+            generate (callable): Compiled per-value generator for the field,
+                used for strategies without a dedicated batch form
+        
+        Returns:
+            callable: Function taking a count and returning a list of values
+        
+        Example:
+            >>> config = {'type': 'str', 'strategy': 'list', 'value': ['a', 'b']}
+            >>> generate_column = generator._compile_column(config, None)
+            >>> generate_column(3)
+            ['b', 'a', 'a']
+        """
+        make_column = COLUMN_GENERATORS.get(dispatch_key(field_config))
+        if make_column is not None:
+            generate_column = make_column(intern_value(field_config['value']), self._rng)
+            if generate_column is not None:
+                return generate_column
+        
+        # No batch form: call the per-value generator `count` times
+        return lambda count: [generate() for _ in range(count)]
     
     def _generate_field_value(self, field_config):
         """
         Generate value for a single field based on its config.
         
+        Compiles the field on the fly, so it suits one-off values; rows are
+        generated from the generators compiled in __init__.
+        
         Args:
             field_config (dict): Field configuration from parsed schema
         
@@ -118,44 +320,30 @@ class DataGenerator:
             >>> generator._generate_field_value(config)
             42
         """
-        field_type = field_config['type']
-        strategy = field_config['strategy']
-        value = field_config['value']
-        
-        # Timestamp type
-        if field_type == 'timestamp':
-            return generate_timestamp()
-        
-        # String type
-        elif field_type == 'str':
-            if strategy == 'rand':
-                return generate_str_rand()
-            elif strategy == 'list':
-                return generate_from_list(value)
-            elif strategy == 'static':
-                return generate_static(value)
-            elif strategy == 'empty':
-                return generate_empty('str')
-        
-        # Integer type
-        elif field_type == 'int':
-            if strategy == 'rand':
-                return generate_int_rand()
-            elif strategy == 'range':
-                min_val, max_val = value
-                return generate_int_range(min_val, max_val)
-            elif strategy == 'list':
-                return generate_from_list(value)
-            elif strategy == 'static':
-                return generate_static(value)
-        
-        # Fallback (should not happen with validated schema)
-        self.logger.warning(f"Unknown field type/strategy: {field_type}/{strategy}")
-        return None
+        return self._compile_field(field_config)()
 
 
 # ================ Generator Functions ================
 
+def seed(value=None):
+    """
+    Seed the random number generator behind the module-level helpers.
+    
+    Makes generate_str_rand(), generate_int_rand(), generate_int_range()
+    and generate_from_list() reproducible. DataGenerator instances have
+    their own generators; pass them a seed instead.
+    
+    Args:
+        value (int, optional): Seed; if None, reseeds from system entropy
+    
+    Example:
+        >>> seed(42); first = generate_int_rand()
+        >>> seed(42); generate_int_rand() == first
+        True
+    """
+    _RNG.seed(value)
+
+
 def generate_timestamp():
     """
     Generate current timestamp.
@@ -173,12 +361,19 @@ def generate_timestamp():
     return time.time()
 
 
-def generate_str_rand():
+def generate_str_rand(rng=None, use_secure=False):
     """
-    Generate random string (UUID-based).
+    Generate random string (8 hex characters).
+    
+    Args:
+        rng (random.Random, optional): Random number generator to draw
+            from. If None, uses the module's generator.
+        use_secure (bool): Draw from os.urandom() instead, for strings
+            that must not be predictable (about 4x slower: one system
+            call per string)
     
     Returns:
-        str: Random string (UUID without hyphens, first 8 chars)
+        str: Random string (4 random bytes as lowercase hex)
     
     Example:
         >>> s = generate_str_rand()
@@ -187,8 +382,36 @@ def generate_str_rand():
         >>> isinstance(s, str)
         True
     """
-    # Generate UUID and take first 8 characters (without hyphens)
-    return uuid.uuid4().hex[:8]
+    # Same alphabet and length as the first 8 chars of a UUID4 hex,
+    # without building a UUID object
+    if use_secure:
+        return os.urandom(4).hex()
+    return (rng or _RNG).getrandbits(32).to_bytes(4, 'big').hex()
+
+
+def generate_str_rand_column(count, rng=None, use_secure=False):
+    """
+    Generate a column of random strings (8 hex characters each).
+    
+    Args:
+        count (int): Number of strings to generate
+        rng (random.Random, optional): Random number generator to draw
+            from. If None, uses the module's generator.
+        use_secure (bool): Draw from os.urandom() instead
+    
+    Returns:
+        list: List of random 8-char hex strings
+    
+    Example:
+        >>> column = generate_str_rand_column(3)
+        >>> len(column), len(column[0])
+        (3, 8)
+    """
+    if use_secure:
+        hex_block = os.urandom(4 * count).hex()
+    else:
+        hex_block = (rng or _RNG).getrandbits(32 * count).to_bytes(4 * count, 'big').hex()
+    return [hex_block[i:i + 8] for i in range(0, 8 * count, 8)]
 
 
 def generate_int_rand():
@@ -205,7 +428,20 @@ def generate_int_rand():
         >>> 0 <= n <= 999999
         True
     """
-    return random.randint(0, 999999)
+    return _randbelow(1000000)
+
+
+def _randbelow(n, getrandbits=_RNG.getrandbits):
+    # Same rejection sampling as random.randrange, minus its call layers:
+    # draw just enough bits, retry when >= n. An empty range would never
+    # draw an accepted value, so it is rejected like randrange does
+    if n <= 0:
+        raise ValueError(f"upper bound must be positive, got {n}")
+    bits = n.bit_length()
+    value = getrandbits(bits)
+    while value >= n:
+        value = getrandbits(bits)
+    return value
 
 
 def generate_from_list(values):
@@ -224,7 +460,7 @@ def generate_from_list(values):
         >>> result in values
         True
     """
-    return random.choice(values)
+    return _RNG.choice(values)
 
 
 def generate_int_range(min_val, max_val):
@@ -238,12 +474,16 @@ def generate_int_range(min_val, max_val):
     Returns:
         int: Random integer in range [min_val, max_val]
     
+    Raises:
+        ValueError: If max_val is less than min_val
+    
     Example:
         >>> n = generate_int_range(18, 65)
         >>> 18 <= n <= 65
         True
     """
-    return random.randint(min_val, max_val)
+    min_val, max_val = _check_int_range((min_val, max_val))
+    return min_val + _randbelow(max_val - min_val + 1)
 
 
 def generate_static(value):
@@ -286,14 +526,229 @@ def generate_empty(field_type):
     return None
 
 
+def compile_line_builder(fields):
+    """
+    Compile a function that builds one line from per-field generators.
+    
+    The function is generated for the given fields as a single dict
+    display with the generators bound as default args, so building a line
+    runs no loop and does no lookups beyond the calls themselves (~30%
+    faster than a dict comprehension over the fields).
+    
+    Args:
+        fields (tuple): (field_name, zero-arg generator) pairs
+    
+    Returns:
+        callable: Function taking no arguments and returning a line dict
+    
+    Example:
+        >>> build_line = compile_line_builder((('id', lambda: 1),))
+        >>> build_line()
+        {'id': 1}
+    """
+    params = ', '.join(f'_f{i}=_generators[{i}]' for i in range(len(fields)))
+    items = ', '.join(f'{field_name!r}: _f{i}()' for i, (field_name, _) in enumerate(fields))
+    source = f'def build_line({params}):\n    return {{{items}}}\n'
+    
+    namespace = {'_generators': tuple(generate for _, generate in fields)}
+    exec(compile(source, '<line builder>', 'exec'), namespace)
+    return namespace['build_line']
+
+
+# ================ Field Dispatch Tables ================
+#
+# Compiled generators are looked up by (type, strategy) in a single dict
+# access instead of a chain of string comparisons. Each factory takes the
+# field's parsed value and the generator's random.Random and returns a
+# callable; hot callables are bound as default args to avoid global
+# lookups on every call.
+
+def intern_value(value):
+    """
+    Intern the strings of a static or list field value.
+    
+    Generated strings are then the interned objects, so comparing them
+    with equal literals is an identity check. Only str values (alone or
+    in a list) are interned; anything else is returned unchanged.
+    
+    Args:
+        value (any): Field's parsed value
+    
+    Returns:
+        any: The value, with strings interned
+    
+    Example:
+        >>> intern_value(['a', 1]) == ['a', 1]
+        True
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is list:
+        return [sys.intern(item) if type(item) is str else item for item in value]
+    return value
+
+
+def dispatch_key(field_config):
+    """
+    Get the dispatch table key for a field config.
+    
+    Timestamps are generated the same way whatever the strategy, so their
+    key ignores it.
+    
+    Args:
+        field_config (dict): Field configuration from parsed schema
+    
+    Returns:
+        tuple: (type, strategy) key, with strategy None for timestamps
+    
+    Example:
+        >>> dispatch_key({'type': 'int', 'strategy': 'range', 'value': (1, 5)})
+        ('int', 'range')
+    """
+    if field_config['type'] == 'timestamp':
+        return ('timestamp', None)
+    return (field_config['type'], field_config['strategy'])
+
+
+def _make_static(value, rng):
+    return lambda static=value: static
+
+
+def _make_choice(value, rng):
+    return lambda values=value, choice=rng.choice: choice(values)
+
+
+def _check_int_range(value):
+    # The generator loops would never finish on an empty range
+    min_val, max_val = value
+    if max_val < min_val:
+        raise ValueError(f"empty int range ({min_val}, {max_val})")
+    return min_val, max_val
+
+
+def _make_int_range(value, rng):
+    # Inlined rng.randint(): draws the same values for a given seed
+    min_val, max_val = _check_int_range(value)
+    span = max_val - min_val + 1
+    bits = span.bit_length()
+    getrandbits = rng.getrandbits
+    
+    def generate():
+        offset = getrandbits(bits)
+        while offset >= span:
+            offset = getrandbits(bits)
+        return min_val + offset
+    
+    return generate
+
+
+# (type, strategy) -> factory(value, rng) returning a zero-arg generator
+FIELD_GENERATORS = {
+    ('timestamp', None): lambda value, rng: time.time,
+    ('str', 'rand'): lambda value, rng: lambda: generate_str_rand(rng),
+    ('str', 'list'): _make_choice,
+    ('str', 'static'): _make_static,
+    ('str', 'empty'): lambda value, rng: lambda: '',
+    ('int', 'rand'): lambda value, rng: _make_int_range((0, 999999), rng),
+    ('int', 'range'): _make_int_range,
+    ('int', 'list'): _make_choice,
+    ('int', 'static'): _make_static,
+}
+
+
+def _make_static_column(value, rng):
+    return lambda count, static=value: [static] * count
+
+
+def _make_choices_column(value, rng):
+    return lambda count, values=value, choices=rng.choices: choices(values, k=count)
+
+
+def _make_int_range_column(value, rng):
+    # Draw the whole column in one C-level call when the span allows it
+    min_val, max_val = _check_int_range(value)
+    if max_val - min_val >= MAX_BULK_INT_SPAN:
+        return None
+    population = range(min_val, max_val + 1)
+    return lambda count, choices=rng.choices: choices(population, k=count)
+
+
+# (type, strategy) -> factory(value, rng) returning a count -> list
+# generator, or None when the field has no batch form for that value
+COLUMN_GENERATORS = {
+    # Read the clock once per batch; rows generated in the same call are
+    # effectively simultaneous anyway
+    ('timestamp', None): lambda value, rng: lambda count, now=time.time: [now()] * count,
+    # One block of random bits for the whole column, sliced into 8-char hex
+    ('str', 'rand'): lambda value, rng: lambda count: generate_str_rand_column(count, rng),
+    ('str', 'list'): _make_choices_column,
+    ('str', 'static'): _make_static_column,
+    ('str', 'empty'): lambda value, rng: lambda count: [''] * count,
+    ('int', 'rand'): lambda value, rng: _make_int_range_column((0, 999999), rng),
+    ('int', 'range'): _make_int_range_column,
+    ('int', 'list'): _make_choices_column,
+    ('int', 'static'): _make_static_column,
+}
+
+
+# (type, strategy) -> function encoding one value of the column as JSON,
+# where a cheaper exact equivalent of encode_json_line exists; json
+# writes ints and finite floats with their repr()
+COLUMN_ENCODERS = {
+    ('timestamp', None): float.__repr__,
+    ('int', 'rand'): int.__repr__,
+    ('int', 'range'): int.__repr__,
+}
+
+
 # ================ Convenience Function ================
 
-def create_generator(parsed_schema):
+# Unseeded generators built in this process, keyed by schema content.
+# Emptied in forked children: a copied generator would carry the
+# parent's random state, so every worker would repeat the same values
+_generator_cache = {}
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_generator_cache.clear)
+
+# Maximum number of cached generators per process
+GENERATOR_CACHE_SIZE = 8
+
+
+def schema_cache_key(parsed_schema):
+    """
+    Build a hashable key describing a parsed schema's content.
+    
+    Args:
+        parsed_schema (dict): Parsed schema from SchemaParser
+    
+    Returns:
+        tuple: Hashable key; equal schemas give equal keys
+    
+    Example:
+        >>> schema_cache_key({'s': {'type': 'str', 'strategy': 'list', 'value': ['a', 'b']}})
+        (('s', 'str', 'list', ('a', 'b')),)
+    """
+    return tuple(
+        (field_name,
+         field_config['type'],
+         field_config['strategy'],
+         tuple(field_config['value']) if isinstance(field_config['value'], list) else field_config['value'])
+        for field_name, field_config in parsed_schema.items()
+    )
+
+
+def create_generator(parsed_schema, seed=None):
     """
     Convenience function to create DataGenerator instance.
     
+    Unseeded generators are cached per process by schema content, so
+    repeated calls with the same schema (e.g. once per task in a worker
+    process) reuse the already compiled generator.
+    
     Args:
         parsed_schema (dict): Parsed schema from SchemaParser
+        seed (int, optional): Seed for reproducible output. Seeded
+            generators are always created fresh.
     
     Returns:
         DataGenerator: Initialized generator instance
@@ -303,5 +758,21 @@ def create_generator(parsed_schema):
         >>> gen = create_generator(schema)
         >>> isinstance(gen, DataGenerator)
         True
+        >>> create_generator(schema) is gen
+        True
     """
-    return DataGenerator(parsed_schema)
+    if seed is not None:
+        return DataGenerator(parsed_schema, seed)
+    
+    key = schema_cache_key(parsed_schema)
+    generator = _generator_cache.get(key)
+    
+    if generator is None:
+        # Evict the oldest entry when full
+        if len(_generator_cache) >= GENERATOR_CACHE_SIZE:
+            del _generator_cache[next(iter(_generator_cache))]
+        
+        generator = DataGenerator(parsed_schema)
+        _generator_cache[key] = generator
+    
+    return generator
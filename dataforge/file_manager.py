@@ -10,12 +10,43 @@ This module handles:
 """
 
 import os
+import stat
 import sys
 import json
+import logging
 import uuid
-import random
 import glob
-from dataforge.logger import get_logger
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from dataforge.logger import get_logger, log_progress, progress_interval
+from dataforge.utils import encode_json_line, stat_path, count_lines_in_file
+
+
+# Flags and permission bits for output files, matching open(path, 'wb')
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+WRITE_MODE = 0o666
+
+# Buffers handed to one os.writev() call; stays below IOV_MAX (1024 on Linux)
+WRITEV_MAX_CHUNKS = 512
+
+# Extension of the index written next to each shard (see shard_index_path).
+# It does not end in .json, so '*.json' patterns only ever see data files;
+# clear_directory removes the index explicitly along with its shard
+SHARD_INDEX_EXTENSION = '.idx'
+
+# Upper bound on threads used to unlink files in clear_directory
+MAX_CLEAR_WORKERS = 32
+
+
+# File name prefix builders by prefix type; each takes the file index
+FILE_PREFIXES = {
+    # Sequential numbering: 1_data.json, 2_data.json, ...
+    'count': str,
+    # Random 6-character hex prefix
+    'random': lambda index: os.urandom(3).hex(),
+    # UUID prefix (full UUID)
+    'uuid': lambda index: str(uuid.uuid4()),
+}
 
 
 def generate_file_name(base_name, prefix_type, index):
@@ -43,34 +74,21 @@ def generate_file_name(base_name, prefix_type, index):
         >>> generate_file_name('data', 'uuid', 0)
         'a1b2c3d4-e5f6-..._data.json'  # UUID
     """
-    logger = get_logger()
-    
-    if prefix_type == 'count':
-        # Sequential numbering: 1_data.json, 2_data.json, ...
-        file_name = f"{index}_{base_name}.json"
+    make_prefix = FILE_PREFIXES.get(prefix_type)
     
-    elif prefix_type == 'random':
-        # Random 6-character hex prefix
-        random_prefix = ''.join(random.choices('0123456789abcdef', k=6))
-        file_name = f"{random_prefix}_{base_name}.json"
-    
-    elif prefix_type == 'uuid':
-        # UUID prefix (full UUID)
-        uuid_prefix = str(uuid.uuid4())
-        file_name = f"{uuid_prefix}_{base_name}.json"
-    
-    else:
-        logger.error(f"Invalid prefix_type: {prefix_type}. Must be 'count', 'random', or 'uuid'")
+    if make_prefix is None:
+        get_logger().error(f"Invalid prefix_type: {prefix_type}. Must be 'count', 'random', or 'uuid'")
         sys.exit(1)
     
-    return file_name
+    return f"{make_prefix(index)}_{base_name}.json"
 
 
 def write_jsonlines(filepath, data_lines):
     """
     Write data lines to file in JSON Lines format.
     
-    Each line is a separate JSON object.
+    Each line is a separate JSON object. All lines are serialized first
+    and written with a single write() call.
     
     Args:
         filepath (str): Full path to the file
@@ -86,15 +104,113 @@ def write_jsonlines(filepath, data_lines):
         >>> data = [{'id': 1, 'name': 'Alice'}, {'id': 2, 'name': 'Bob'}]
         >>> write_jsonlines('/path/to/file.json', data)
     """
+    write_jsonlines_batches(filepath, [data_lines])
+
+
+def _write_all(fd, data):
+    """
+    Write all bytes to a file descriptor, retrying after partial writes.
+    
+    Args:
+        fd (int): Open file descriptor
+        data (bytes): Data to write
+    """
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _write_lines(fd, lines):
+    """
+    Write encoded lines to a file descriptor.
+    
+    Uses vectored writes where available, so the lines never need to be
+    joined into one contiguous payload; otherwise falls back to a single
+    joined write.
+    
+    Args:
+        fd (int): Open file descriptor
+        lines (list[bytes]): Encoded lines, each ending with a newline
+    """
+    if not hasattr(os, 'writev'):
+        _write_all(fd, b''.join(lines))
+        return
+    
+    for start in range(0, len(lines), WRITEV_MAX_CHUNKS):
+        chunk = lines[start:start + WRITEV_MAX_CHUNKS]
+        written = os.writev(fd, chunk)
+        
+        # Partial write: finish the rest of this chunk the slow way
+        if written < sum(map(len, chunk)):
+            _write_all(fd, b''.join(chunk)[written:])
+
+
+def _write_batches(fd, batches):
+    """
+    Encode batches of data lines and write them to a file descriptor.
+    
+    Args:
+        fd (int): Open file descriptor
+        batches (iterable): Iterable of lists of dictionaries to write,
+            or of already encoded lines (see
+            DataGenerator.iter_encoded_batches), which are written as-is
+    
+    Returns:
+        tuple: (lines written, bytes written)
+    """
+    lines_written = 0
+    bytes_written = 0
+    
+    for batch in batches:
+        if not batch:
+            continue
+        if isinstance(batch[0], bytes):
+            encoded = batch
+        else:
+            encoded = [(line + '\n').encode('utf-8') for line in map(encode_json_line, batch)]
+        _write_lines(fd, encoded)
+        lines_written += len(batch)
+        bytes_written += sum(map(len, encoded))
+    
+    return lines_written, bytes_written
+
+
+def write_jsonlines_batches(filepath, batches):
+    """
+    Write batches of data lines to file in JSON Lines format.
+    
+    Each batch is serialized to UTF-8 lines and written straight to the
+    file descriptor, so only one batch needs to be in memory at a time
+    when `batches` is a generator (see DataGenerator.iter_batches).
+    
+    Args:
+        filepath (str): Full path to the file
+        batches (iterable): Iterable of lists of dictionaries to write, or
+            of already encoded lines (see DataGenerator.iter_encoded_batches)
+    
+    Returns:
+        None
+    
+    Raises:
+        SystemExit: If file writing fails
+    
+    Example:
+        >>> write_jsonlines_batches('/path/to/file.json', generator.iter_batches(100000))
+    """
     logger = get_logger()
     
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for line_data in data_lines:
-                json_line = json.dumps(line_data)
-                f.write(json_line + '\n')
+        # Batches are already large, so a buffered file object would only
+        # copy them; write each batch's encoded lines to the raw descriptor
+        fd = os.open(filepath, WRITE_FLAGS, WRITE_MODE)
+        try:
+            lines_written, _ = _write_batches(fd, batches)
+        finally:
+            os.close(fd)
         
-        logger.info(f"File written: {filepath} ({len(data_lines)} lines)")
+        # Per-file message: keep it out of INFO output for large batches
+        logger.debug("File written: %s (%d lines)", filepath, lines_written)
     
     except IOError as e:
         logger.error(f"Failed to write file {filepath}: {e}")
@@ -105,6 +221,79 @@ def write_jsonlines(filepath, data_lines):
         sys.exit(1)
 
 
+def shard_index_path(filepath):
+    """
+    Get the path of the index file for a shard.
+    
+    Args:
+        filepath (str): Path to the shard file
+    
+    Returns:
+        str: Path to the shard's index file
+    
+    Example:
+        >>> shard_index_path('/tmp/1_data.json')
+        '/tmp/1_data.idx'
+    """
+    return os.path.splitext(filepath)[0] + SHARD_INDEX_EXTENSION
+
+
+def write_jsonlines_shard(filepath, parts):
+    """
+    Write several logical files into one JSON Lines shard.
+    
+    The parts are written back to back, so the shard itself is plain
+    JSON Lines. Their boundaries are recorded in an index file next to
+    it (see shard_index_path): a JSON list with the byte offset and line
+    count of each part, in order.
+    
+    Args:
+        filepath (str): Full path to the shard file
+        parts (iterable): Iterable of parts, each an iterable of batches
+            (lists of dictionaries) as accepted by write_jsonlines_batches
+    
+    Returns:
+        list[dict]: Index entries with 'offset' and 'lines' for each part
+    
+    Raises:
+        SystemExit: If file writing fails
+    
+    Example:
+        >>> parts = (generator.iter_batches(10) for _ in range(3))
+        >>> write_jsonlines_shard('/path/to/shard.json', parts)
+        [{'offset': 0, 'lines': 10}, {'offset': 412, 'lines': 10}, ...]
+    """
+    logger = get_logger()
+    
+    try:
+        index = []
+        offset = 0
+        
+        fd = os.open(filepath, WRITE_FLAGS, WRITE_MODE)
+        try:
+            for batches in parts:
+                lines_written, bytes_written = _write_batches(fd, batches)
+                index.append({'offset': offset, 'lines': lines_written})
+                offset += bytes_written
+        finally:
+            os.close(fd)
+        
+        with open(shard_index_path(filepath), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        
+        logger.debug("Shard written: %s (%d part(s), %d bytes)", filepath, len(index), offset)
+        
+        return index
+    
+    except IOError as e:
+        logger.error(f"Failed to write shard {filepath}: {e}")
+        sys.exit(1)
+    
+    except Exception as e:
+        logger.error(f"Unexpected error writing shard {filepath}: {e}")
+        sys.exit(1)
+
+
 def write_to_console(data_lines):
     """
     Write data lines to console in JSON format.
@@ -118,15 +307,15 @@ def write_to_console(data_lines):
     Example:
         >>> data = [{'id': 1}, {'id': 2}]
         >>> write_to_console(data)
-        {"id": 1}
-        {"id": 2}
+        {"id":1}
+        {"id":2}
     """
     logger = get_logger()
     
     logger.debug(f"Writing {len(data_lines)} line(s) to console")
     
-    for line_data in data_lines:
-        print(json.dumps(line_data))
+    if data_lines:
+        print('\n'.join(map(encode_json_line, data_lines)))
 
 
 def clear_directory(path, file_pattern='*.json'):
@@ -150,36 +339,106 @@ def clear_directory(path, file_pattern='*.json'):
     logger = get_logger()
     
     # Validate path
-    if not os.path.exists(path):
+    st = stat_path(path)
+    if st is None:
         logger.error(f"Directory does not exist: {path}")
         sys.exit(1)
     
-    if not os.path.isdir(path):
+    if not stat.S_ISDIR(st.st_mode):
         logger.error(f"Path is not a directory: {path}")
         sys.exit(1)
     
     # Find matching files
-    pattern = os.path.join(path, file_pattern)
-    matching_files = glob.glob(pattern)
+    matching_files = _find_matching_files(path, file_pattern)
     
     if not matching_files:
         logger.info(f"No files matching '{file_pattern}' found in {path}")
         return 0
     
-    # Remove files
-    removed_count = 0
-    for file_path in matching_files:
-        try:
-            os.remove(file_path)
-            logger.debug(f"Removed: {os.path.basename(file_path)}")
-            removed_count += 1
-        except Exception as e:
-            logger.warning(f"Failed to remove {file_path}: {e}")
+    # Remove files; unlink blocks on I/O without holding the GIL,
+    # so threads overlap the syscalls
+    workers = min(MAX_CLEAR_WORKERS, (os.cpu_count() or 1) * 4,
+                  len(matching_files))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        removed_count = sum(executor.map(_remove_file, matching_files))
     
     logger.info(f"Cleared {removed_count} file(s) from {path}")
     return removed_count
 
 
+def _remove_file(file_path):
+    """
+    Remove a single file, logging a warning on failure.
+    
+    If the file is a shard, its index file (see shard_index_path) is
+    removed along with it.
+    
+    Args:
+        file_path (str): Path to the file
+    
+    Returns:
+        bool: True if the file was removed
+    """
+    logger = get_logger()
+    try:
+        os.remove(file_path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Removed: %s", os.path.basename(file_path))
+    except Exception as e:
+        logger.warning(f"Failed to remove {file_path}: {e}")
+        return False
+    
+    # Most files are not shards, so a missing index is the common case
+    index_path = shard_index_path(file_path)
+    if index_path != file_path:
+        try:
+            os.remove(index_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to remove {index_path}: {e}")
+    
+    return True
+
+
+def _find_matching_files(path, file_pattern):
+    """
+    List files in a directory whose names match a glob pattern.
+    
+    Uses os.scandir so file types come from the directory entries instead
+    of a stat() per file. Like glob, hidden files only match patterns that
+    start with a dot, and symlinks to files match like the files they
+    point to. Patterns with a directory part (e.g. 'sub/*.json') are
+    handed to glob itself.
+    
+    Args:
+        path (str): Directory path to scan
+        file_pattern (str): Glob-style file pattern, relative to path
+    
+    Returns:
+        list: Paths of the matching files
+    """
+    if os.sep in file_pattern or (os.altsep and os.altsep in file_pattern):
+        return [file_path for file_path in glob.glob(os.path.join(path, file_pattern))
+                if os.path.isfile(file_path)]
+    
+    include_hidden = file_pattern.startswith('.')
+    suffix = file_pattern[1:]
+    if file_pattern.startswith('*') and not any(c in suffix for c in '*?['):
+        # Common '*.ext' case: a plain suffix check, no pattern matching
+        matches = lambda name: name.endswith(suffix)
+    else:
+        matches = lambda name: fnmatch.fnmatch(name, file_pattern)
+    
+    with os.scandir(path) as entries:
+        return [
+            entry.path for entry in entries
+            if (include_hidden or not entry.name.startswith('.'))
+            and matches(entry.name)
+            and entry.is_file()
+        ]
+
+
 def create_single_file(params):
     """
     Create a single file with generated data.
@@ -190,7 +449,9 @@ def create_single_file(params):
             - file_name (str): Base file name
             - prefix_type (str): Prefix type ('count', 'random', 'uuid')
             - index (int): File index (for 'count' prefix)
-            - data (list): List of data lines to write
+            - data (list): List of data lines to write, or
+            - batches (iterable): Iterable of lists of data lines, or of
+              encoded lines, to stream into the file (used instead of 'data')
     
     Returns:
         str: Full path to created file
@@ -217,7 +478,6 @@ def create_single_file(params):
     base_name = params['file_name']
     prefix_type = params['prefix_type']
     index = params['index']
-    data_lines = params['data']
     
     # Generate file name
     file_name = generate_file_name(base_name, prefix_type, index)
@@ -226,15 +486,23 @@ def create_single_file(params):
     filepath = os.path.join(directory, file_name)
     
     # Write data to file
-    write_jsonlines(filepath, data_lines)
+    if 'batches' in params:
+        write_jsonlines_batches(filepath, params['batches'])
+    else:
+        write_jsonlines(filepath, params['data'])
     
     return filepath
 
 
-def create_multiple_files(path, file_name, prefix_type, files_count, data_lines_per_file, generator):
+def create_multiple_files(path, file_name, prefix_type, files_count, data_lines_per_file, generator,
+                          shard_size=1):
     """
     Create multiple files with generated data.
     
+    With shard_size > 1, every shard_size logical files are written into
+    one physical shard with an index file (see write_jsonlines_shard),
+    trading many small open/close calls for fewer, larger files.
+    
     Args:
         path (str): Directory path
         file_name (str): Base file name
@@ -242,9 +510,11 @@ def create_multiple_files(path, file_name, prefix_type, files_count, data_lines_
         files_count (int): Number of files to create
         data_lines_per_file (int): Number of data lines per file
         generator: DataGenerator instance
+        shard_size (int): Logical files per physical file (default: 1,
+            one file each)
     
     Returns:
-        list: List of created file paths
+        list: List of created file paths (shard paths when sharding)
     
     Example:
         >>> from dataforge.data_generator import create_generator
@@ -256,33 +526,75 @@ def create_multiple_files(path, file_name, prefix_type, files_count, data_lines_
     """
     logger = get_logger()
     
+    if shard_size > 1:
+        return _create_sharded_files(path, file_name, prefix_type, files_count,
+                                     data_lines_per_file, generator, shard_size)
+    
     logger.info(f"Creating {files_count} file(s) with {data_lines_per_file} lines each")
     
     created_files = []
+    log_every = progress_interval(files_count)
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     for i in range(1, files_count + 1):
-        # Generate data for this file
-        data_lines = generator.generate_lines(data_lines_per_file)
-        
-        # Create file
+        # Create file, streaming data in batches as it is generated
         params = {
             'path': path,
             'file_name': file_name,
             'prefix_type': prefix_type,
             'index': i,
-            'data': data_lines
+            'batches': generator.iter_encoded_batches(data_lines_per_file)
         }
         
         filepath = create_single_file(params)
         created_files.append(filepath)
         
-        logger.debug(f"Created file {i}/{files_count}: {os.path.basename(filepath)}")
+        if debug:
+            logger.debug("Created file %d/%d: %s", i, files_count, os.path.basename(filepath))
+        
+        if i % log_every == 0 or i == files_count:
+            log_progress(logger, i, files_count, "files")
     
     logger.info(f"Successfully created {len(created_files)} file(s)")
     
     return created_files
 
 
+def _create_sharded_files(path, file_name, prefix_type, files_count, data_lines_per_file, generator,
+                          shard_size):
+    """
+    Create logical files grouped into shards of shard_size files each.
+    
+    Shards are named like regular files, numbered from 1 for the 'count'
+    prefix. Arguments match create_multiple_files().
+    
+    Returns:
+        list: List of created shard paths
+    """
+    logger = get_logger()
+    
+    shards_count = -(-files_count // shard_size)
+    logger.info(f"Creating {files_count} file(s) with {data_lines_per_file} lines each "
+                f"in {shards_count} shard(s)")
+    
+    created_shards = []
+    
+    for shard in range(1, shards_count + 1):
+        files_done = (shard - 1) * shard_size
+        files_in_shard = min(shard_size, files_count - files_done)
+        
+        filepath = os.path.join(path, generate_file_name(file_name, prefix_type, shard))
+        parts = (generator.iter_encoded_batches(data_lines_per_file) for _ in range(files_in_shard))
+        write_jsonlines_shard(filepath, parts)
+        created_shards.append(filepath)
+        
+        log_progress(logger, files_done + files_in_shard, files_count, "files")
+    
+    logger.info(f"Successfully created {len(created_shards)} shard(s)")
+    
+    return created_shards
+
+
 def get_file_stats(filepath):
     """
     Get statistics about a file.
@@ -298,24 +610,18 @@ def get_file_stats(filepath):
         >>> stats
         {'exists': True, 'size_bytes': 1024, 'lines': 10}
     """
-    if not os.path.exists(filepath):
+    st = stat_path(filepath)
+    if st is None:
         return {
             'exists': False,
             'size_bytes': 0,
             'lines': 0
         }
     
-    size_bytes = os.path.getsize(filepath)
-    
-    # Count lines
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = sum(1 for _ in f)
-    except Exception:
-        lines = 0
+    size_bytes = st.st_size
     
     return {
         'exists': True,
         'size_bytes': size_bytes,
-        'lines': lines
+        'lines': count_lines_in_file(filepath)
     }
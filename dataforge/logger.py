@@ -8,9 +8,22 @@ for tracking all operations in the DataForge utility.
 
 import logging
 import sys
+import os
 
 
-def setup_logger(name='dataforge', level=logging.INFO, log_file=None):
+# Number of progress messages to log over a long-running loop
+PROGRESS_LOG_STEPS = 10
+
+# Log record formats; the fast one skips timestamp formatting, which is
+# most of the per-record cost when many messages are logged
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+FAST_LOG_FORMAT = '%(levelname)s - %(message)s'
+
+# Environment variable that selects FAST_LOG_FORMAT when set to 1
+FAST_LOG_ENV = 'DATAFORGE_FAST_LOG'
+
+
+def setup_logger(name='dataforge', level=logging.INFO, log_file=None, fast=None):
     """
     Configure and return a logger instance.
     
@@ -18,6 +31,8 @@ def setup_logger(name='dataforge', level=logging.INFO, log_file=None):
         name (str): Logger name (default: 'dataforge')
         level (int): Logging level (default: logging.INFO)
         log_file (str, optional): Path to log file for file output
+        fast (bool, optional): Use the format without timestamps. If None,
+            enabled when the DATAFORGE_FAST_LOG environment variable is 1.
     
     Returns:
         logging.Logger: Configured logger instance
@@ -33,9 +48,15 @@ def setup_logger(name='dataforge', level=logging.INFO, log_file=None):
     # Remove existing handlers to avoid duplicates
     logger.handlers = []
     
+    # Records are fully handled here; don't also walk the parent loggers
+    logger.propagate = False
+    
+    if fast is None:
+        fast = os.environ.get(FAST_LOG_ENV) == '1'
+    
     # Create formatter
     formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        fmt=FAST_LOG_FORMAT if fast else LOG_FORMAT,
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
@@ -121,6 +142,25 @@ def log_progress(logger, current, total, item_name="items"):
     logger.info(f"Progress: {current}/{total} {item_name} ({percentage:.1f}%)")
 
 
+def progress_interval(total):
+    """
+    Get how often to log progress so a loop logs about PROGRESS_LOG_STEPS times.
+    
+    Args:
+        total (int): Total count
+    
+    Returns:
+        int: Log progress every this many items (at least 1)
+    
+    Example:
+        >>> progress_interval(1000)
+        100
+        >>> progress_interval(3)
+        1
+    """
+    return max(1, total // PROGRESS_LOG_STEPS)
+
+
 # Default logger instance
 _default_logger = None
 
@@ -7,12 +7,28 @@ to improve performance for large batch operations.
 """
 
 import os
-from multiprocessing import Pool
-from dataforge.logger import get_logger
+import sys
+import logging
+import multiprocessing
+from contextlib import nullcontext
+from dataforge.logger import get_logger, log_progress
 from dataforge.data_generator import create_generator
 from dataforge.file_manager import create_single_file
 
 
+# Number of tasks each process gets on average; more, smaller tasks give
+# better load balancing at the cost of a little dispatch overhead
+TASKS_PER_PROCESS = 4
+
+# Start method for worker processes. With fork, workers inherit the pool
+# initializer's arguments (including the parsed schema) from the parent's
+# memory instead of unpickling them; other platforms keep their default.
+START_METHOD = 'fork' if sys.platform.startswith('linux') else None
+
+# Common parameters of the current job, set in each worker by init_worker()
+_worker_params = None
+
+
 def distribute_work(total_files, num_processes):
     """
     Distribute file generation work across processes.
@@ -58,13 +74,15 @@ def worker_function(args):
     """
     Worker function for parallel file generation.
     
-    This function is called by each process in the pool.
+    This function is called by the pool once per task; each task covers
+    a contiguous range of file indices starting at common_params['start_index'].
     
     Args:
         args (tuple): (process_id, files_to_create, common_params)
-            - process_id (int): ID of this worker process
+            - process_id (int): ID of this task
             - files_to_create (int): Number of files this worker should create
-            - common_params (dict): Common parameters for file generation
+            - common_params (dict): Common parameters for file generation;
+              a prebuilt 'generator' is used when present
     
     Returns:
         list[str]: List of created file paths
@@ -86,21 +104,24 @@ def worker_function(args):
     
     logger.debug(f"Process {process_id}: Starting, will create {files_to_create} file(s)")
     
-    # Create generator for this process
-    generator = create_generator(common_params['parsed_schema'])
+    # Use the generator built by init_worker(), or create one for this call
+    generator = common_params.get('generator')
+    if generator is None:
+        generator = create_generator(common_params['parsed_schema'])
     
     # Calculate starting index for this process
     # Each process gets a unique range of indices
     start_index = common_params.get('start_index', 1)
     
     created_files = []
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     for i in range(files_to_create):
         # Calculate file index
         file_index = start_index + i
         
-        # Generate data for this file
-        data_lines = generator.generate_lines(common_params['data_lines'])
+        # Data for this file is generated in batches while it is written
+        data_batches = generator.iter_encoded_batches(common_params['data_lines'])
         
         # Create file parameters
         file_params = {
@@ -108,21 +129,125 @@ def worker_function(args):
             'file_name': common_params['file_name'],
             'prefix_type': common_params['prefix_type'],
             'index': file_index,
-            'data': data_lines
+            'batches': data_batches
         }
         
         # Create the file
         filepath = create_single_file(file_params)
         created_files.append(filepath)
         
-        logger.debug(f"Process {process_id}: Created file {i+1}/{files_to_create}: {os.path.basename(filepath)}")
+        if debug:
+            logger.debug("Process %d: Created file %d/%d: %s",
+                         process_id, i + 1, files_to_create, os.path.basename(filepath))
     
     logger.debug(f"Process {process_id}: Completed, created {len(created_files)} file(s)")
     
     return created_files
 
 
-def generate_files_parallel(params):
+def init_worker(common_params):
+    """
+    Pool initializer: store common parameters in the worker process.
+    
+    Runs once per worker process, so the parameters (including the parsed
+    schema) are transferred once per process instead of once per task.
+    The generator is built here too and stored with the parameters, so
+    every task the worker runs reuses the same compiled generator.
+    
+    Args:
+        common_params (dict): Common parameters for file generation
+    """
+    global _worker_params
+    generator = create_generator(common_params['parsed_schema'])
+    _worker_params = dict(common_params, generator=generator)
+
+
+def run_task(task):
+    """
+    Run one task in a worker process set up by init_worker().
+    
+    Args:
+        task (tuple): (task_id, start_index, files_to_create)
+    
+    Returns:
+        list[str]: List of created file paths
+    """
+    task_id, start_index, files_to_create = task
+    task_params = dict(_worker_params, start_index=start_index)
+    return worker_function((task_id, files_to_create, task_params))
+
+
+def run_indexed_task(item):
+    """
+    Run a task and tag its result with the task's position.
+    
+    Lets results arrive in completion order while the caller still
+    restores the original file order.
+    
+    Args:
+        item (tuple): (position, task) where task is passed to run_task()
+    
+    Returns:
+        tuple: (position, list of created file paths)
+    """
+    position, task = item
+    return position, run_task(task)
+
+
+def _common_params(params):
+    """
+    Build the parameters shared by every task of a parallel job.
+    
+    Args:
+        params (dict): Parameters dictionary of generate_files_parallel()
+    
+    Returns:
+        dict: Common parameters passed to init_worker()
+    """
+    # Workers resolve relative paths against their own working directory;
+    # pin the output directory to the caller's one now
+    return {
+        'path': os.path.abspath(params['path']),
+        'file_name': params['file_name'],
+        'prefix_type': params['prefix_type'],
+        'data_lines': params['data_lines'],
+        'parsed_schema': params['parsed_schema']
+    }
+
+
+def create_pool(params):
+    """
+    Start a worker pool set up for one parallel generation job.
+    
+    The workers are initialized with the job's common parameters, so the
+    pool can only run generate_files_parallel() with the same params.
+    Callers that want worker start-up out of the way (e.g. for timing)
+    create the pool up front, pass it in, and close it afterwards.
+    
+    Args:
+        params (dict): Parameters dictionary of generate_files_parallel()
+    
+    Returns:
+        multiprocessing.pool.Pool: Started process pool
+    
+    Example:
+        >>> with create_pool(params) as pool:
+        ...     files = generate_files_parallel(params, pool=pool)
+    """
+    logger = get_logger()
+    
+    # Never start more processes than there are files (and hence tasks)
+    pool_size = min(params['multiprocessing'], params['files_count'])
+    logger.debug(f"Creating process pool with {pool_size} worker(s)")
+    
+    # Workers are forked from the caller's current state (working
+    # directory, logging setup), so a pool belongs to a single job
+    context = multiprocessing.get_context(START_METHOD)
+    return context.Pool(processes=pool_size, initializer=init_worker,
+                        initargs=(_common_params(params),))
+
+
+def generate_files_parallel(params, pool=None):
     """
     Generate files in parallel using multiprocessing.
     
@@ -135,6 +260,9 @@ def generate_files_parallel(params):
             - data_lines (int): Number of data lines per file
             - multiprocessing (int): Number of processes to use
             - parsed_schema (dict): Parsed schema for data generation
+        pool (multiprocessing.pool.Pool, optional): Pool from
+            create_pool(params) to run on; the caller keeps ownership.
+            By default a pool is started and shut down for this call.
     
     Returns:
         list[str]: List of all created file paths
@@ -160,50 +288,43 @@ def generate_files_parallel(params):
     
     logger.info(f"Starting parallel generation: {total_files} file(s) with {num_processes} process(es)")
     
-    # Distribute work across processes
-    distribution = distribute_work(total_files, num_processes)
+    # Split work into several tasks per process rather than one big task
+    # each, so faster workers pick up more tasks and uneven files balance out
+    num_tasks = min(total_files, num_processes * TASKS_PER_PROCESS)
+    distribution = distribute_work(total_files, num_tasks)
     
-    # Prepare common parameters for all workers
-    common_params = {
-        'path': params['path'],
-        'file_name': params['file_name'],
-        'prefix_type': params['prefix_type'],
-        'data_lines': params['data_lines'],
-        'parsed_schema': params['parsed_schema']
-    }
-    
-    # Prepare arguments for each worker
-    worker_args = []
+    # Prepare arguments for each task (a contiguous range of file indices);
+    # the common parameters reach each worker once, via init_worker()
+    tasks = []
     current_index = 1
     
-    for process_id in range(num_processes):
-        files_for_this_process = distribution[process_id]
-        
-        # Skip if no files assigned to this process
-        if files_for_this_process == 0:
+    for task_id, files_for_this_task in enumerate(distribution, 1):
+        # Skip if no files assigned to this task
+        if files_for_this_task == 0:
             continue
         
-        # Create parameters for this worker
-        worker_params = common_params.copy()
-        worker_params['start_index'] = current_index
-        
-        worker_args.append((process_id + 1, files_for_this_process, worker_params))
-        
-        # Update index for next process
-        current_index += files_for_this_process
-    
-    # Create process pool and execute
-    logger.debug(f"Creating process pool with {len(worker_args)} worker(s)")
-    
-    all_created_files = []
-    
-    with Pool(processes=num_processes) as pool:
-        # Map worker function to all arguments
-        results = pool.map(worker_function, worker_args)
+        tasks.append((task_id, current_index, files_for_this_task))
         
-        # Flatten results (list of lists -> single list)
-        for result in results:
-            all_created_files.extend(result)
+        # Update index for next task
+        current_index += files_for_this_task
+    
+    task_results = [None] * len(tasks)
+    completed_files = 0
+    
+    # A pool passed in by the caller is left running; otherwise a fresh
+    # pool is started for this call and shut down when it is done
+    pool_context = nullcontext(pool) if pool is not None else create_pool(params)
+    
+    with pool_context as pool:
+        # Tasks are handed out one at a time as workers free up and results
+        # are taken as soon as any task finishes, so a slow early task does
+        # not hold back progress reporting; file order is restored below
+        for position, result in pool.imap_unordered(run_indexed_task, enumerate(tasks), chunksize=1):
+            task_results[position] = result
+            completed_files += len(result)
+            log_progress(logger, completed_files, total_files, "files")
+    
+    all_created_files = [filepath for result in task_results for filepath in result]
     
     logger.info(f"Parallel generation completed: {len(all_created_files)} file(s) created")
     
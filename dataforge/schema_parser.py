@@ -19,9 +19,34 @@ Supported strategies:
 
 import sys
 import re
+import copy
 from dataforge.logger import get_logger
 
 
+# Range form of an int value: rand(min,max)
+INT_RANGE_PATTERN = re.compile(r'rand\((-?\d+),(-?\d+)\)')
+
+
+class SchemaError(Exception):
+    """
+    Invalid field definition in a schema.
+    
+    Raised by SchemaParser.parse_field() and its helpers; parse() collects
+    these for all fields and reports them together.
+    
+    Attributes:
+        field (str): Name of the invalid field
+        rule (str): Short name of the violated rule (e.g. 'type', 'range')
+        message (str): Human-readable description of the problem
+    """
+    
+    def __init__(self, field, rule, message):
+        super().__init__(f"Field '{field}': {message}")
+        self.field = field
+        self.rule = rule
+        self.message = message
+
+
 class SchemaParser:
     """
     Schema parser class.
@@ -30,10 +55,13 @@ class SchemaParser:
     """
     
     # Supported types
-    VALID_TYPES = ['timestamp', 'str', 'int']
+    VALID_TYPES = frozenset(['timestamp', 'str', 'int'])
+    
+    # Supported types in display order, for error messages
+    VALID_TYPE_NAMES = ['timestamp', 'str', 'int']
     
     # Supported strategies
-    VALID_STRATEGIES = ['rand', 'list', 'range', 'static', 'empty']
+    VALID_STRATEGIES = frozenset(['rand', 'list', 'range', 'static', 'empty'])
     
     def __init__(self, schema):
         """
@@ -79,9 +107,20 @@ class SchemaParser:
             self.logger.error("Schema cannot be empty")
             sys.exit(1)
         
+        # Parse every field before failing, so all problems are reported at once
+        errors = []
         for field_name, field_definition in self.schema.items():
             self.logger.debug(f"Parsing field: {field_name} = {field_definition}")
-            self.parsed_schema[field_name] = self.parse_field(field_name, field_definition)
+            try:
+                self.parsed_schema[field_name] = self.parse_field(field_name, field_definition)
+            except SchemaError as e:
+                errors.append(e)
+        
+        if errors:
+            for error in errors:
+                self.logger.error(str(error))
+            self.logger.error(f"Schema has {len(errors)} invalid field(s)")
+            sys.exit(1)
         
         self.logger.info(f"Schema parsed successfully: {len(self.parsed_schema)} field(s)")
         return self.parsed_schema
@@ -98,15 +137,15 @@ class SchemaParser:
             dict: Parsed field structure
         
         Raises:
-            SystemExit: If field definition is invalid
+            SchemaError: If field definition is invalid
         
         Example:
             >>> parser.parse_field("age", "int:rand(18,65)")
             {'type': 'int', 'strategy': 'range', 'value': (18, 65)}
         """
         if not isinstance(field_definition, str):
-            self.logger.error(f"Field '{field_name}': definition must be a string, got: {type(field_definition).__name__}")
-            sys.exit(1)
+            raise SchemaError(field_name, 'definition',
+                              f"definition must be a string, got: {type(field_definition).__name__}")
         
         # Split type and value
         data_type, value_part = self._split_type_value(field_name, field_definition)
@@ -134,15 +173,15 @@ class SchemaParser:
             tuple: (type, value_part)
         
         Raises:
-            SystemExit: If definition format is invalid
+            SchemaError: If definition format is invalid
         
         Example:
             >>> parser._split_type_value("name", "str:rand")
             ('str', 'rand')
         """
         if ':' not in field_definition:
-            self.logger.error(f"Field '{field_name}': definition must be in format 'type:value', got: {field_definition}")
-            sys.exit(1)
+            raise SchemaError(field_name, 'format',
+                              f"definition must be in format 'type:value', got: {field_definition}")
         
         parts = field_definition.split(':', 1)
         data_type = parts[0].strip()
@@ -159,11 +198,11 @@ class SchemaParser:
             data_type (str): Data type to validate
         
         Raises:
-            SystemExit: If type is invalid
+            SchemaError: If type is invalid
         """
         if data_type not in self.VALID_TYPES:
-            self.logger.error(f"Field '{field_name}': invalid type '{data_type}'. Valid types: {self.VALID_TYPES}")
-            sys.exit(1)
+            raise SchemaError(field_name, 'type',
+                              f"invalid type '{data_type}'. Valid types: {self.VALID_TYPE_NAMES}")
     
     def _parse_timestamp_value(self, field_name, value_part):
         """
@@ -266,7 +305,7 @@ class SchemaParser:
             dict: Parsed field structure
         
         Raises:
-            SystemExit: If format is invalid
+            SchemaError: If format is invalid
         
         Example:
             >>> parser._parse_int_value("age", "rand(18,65)")
@@ -276,18 +315,17 @@ class SchemaParser:
         
         # Empty value not allowed for int
         if not value_part:
-            self.logger.error(f"Field '{field_name}': int type requires a value")
-            sys.exit(1)
+            raise SchemaError(field_name, 'int_value', "int type requires a value")
         
         # rand(min,max) -> range
-        range_match = re.match(r'rand\((-?\d+),(-?\d+)\)', value_part)
+        range_match = INT_RANGE_PATTERN.match(value_part)
         if range_match:
             min_val = int(range_match.group(1))
             max_val = int(range_match.group(2))
             
             if min_val >= max_val:
-                self.logger.error(f"Field '{field_name}': range minimum ({min_val}) must be less than maximum ({max_val})")
-                sys.exit(1)
+                raise SchemaError(field_name, 'range',
+                                  f"range minimum ({min_val}) must be less than maximum ({max_val})")
             
             return {
                 'type': 'int',
@@ -308,15 +346,14 @@ class SchemaParser:
             values = self._parse_list(field_name, value_part)
             # Convert to integers
             try:
-                int_values = [int(v) for v in values]
+                int_values = list(map(int, values))
                 return {
                     'type': 'int',
                     'strategy': 'list',
                     'value': int_values
                 }
             except ValueError as e:
-                self.logger.error(f"Field '{field_name}': list contains non-integer values: {e}")
-                sys.exit(1)
+                raise SchemaError(field_name, 'int_list', f"list contains non-integer values: {e}")
         
         # Static integer value
         try:
@@ -327,8 +364,7 @@ class SchemaParser:
                 'value': static_value
             }
         except ValueError:
-            self.logger.error(f"Field '{field_name}': invalid integer value: {value_part}")
-            sys.exit(1)
+            raise SchemaError(field_name, 'int_value', f"invalid integer value: {value_part}")
     
     def _parse_list(self, field_name, list_str):
         """
@@ -342,7 +378,7 @@ class SchemaParser:
             list: List of values (as strings)
         
         Raises:
-            SystemExit: If list is empty
+            SchemaError: If list is empty
         
         Example:
             >>> parser._parse_list("status", "[active,inactive,pending]")
@@ -352,26 +388,31 @@ class SchemaParser:
         content = list_str[1:-1].strip()
         
         if not content:
-            self.logger.error(f"Field '{field_name}': list cannot be empty")
-            sys.exit(1)
-        
-        # Split by comma and strip whitespace
-        values = [v.strip() for v in content.split(',')]
+            raise SchemaError(field_name, 'empty_list', "list cannot be empty")
         
-        # Remove empty values
-        values = [v for v in values if v]
+        # Split by comma, strip whitespace and drop empty values in one pass
+        values = [v for v in map(str.strip, content.split(',')) if v]
         
         if not values:
-            self.logger.error(f"Field '{field_name}': list cannot be empty")
-            sys.exit(1)
+            raise SchemaError(field_name, 'empty_list', "list cannot be empty")
         
         return values
 
 
+# Parsed schemas, keyed by the schema's (field, definition) pairs
+_parsed_schema_cache = {}
+
+# Maximum number of cached parsed schemas per process
+PARSED_SCHEMA_CACHE_SIZE = 8
+
+
 def parse_schema(schema):
     """
     Convenience function to parse schema.
     
+    Results are cached per process by schema content; each call returns
+    its own copy, so callers may modify the result freely.
+    
     Args:
         schema (dict): Schema dictionary
     
@@ -382,5 +423,23 @@ def parse_schema(schema):
         >>> schema = {"name": "str:rand", "age": "int:rand(18,65)"}
         >>> parsed = parse_schema(schema)
     """
-    parser = SchemaParser(schema)
-    return parser.parse()
+    try:
+        # Field order is part of the key: it sets the order of output keys
+        key = tuple(schema.items())
+        hash(key)
+    except (AttributeError, TypeError):
+        # Not a dict of plain definitions; let the parser report it
+        return SchemaParser(schema).parse()
+    
+    parsed = _parsed_schema_cache.get(key)
+    
+    if parsed is None:
+        parsed = SchemaParser(schema).parse()
+        
+        # Evict the oldest entry when full
+        if len(_parsed_schema_cache) >= PARSED_SCHEMA_CACHE_SIZE:
+            del _parsed_schema_cache[next(iter(_parsed_schema_cache))]
+        
+        _parsed_schema_cache[key] = parsed
+    
+    return copy.deepcopy(parsed)
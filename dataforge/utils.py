@@ -5,10 +5,50 @@ Helper functions and common utilities used across the application.
 
 import json
 import os
+import stat
 import sys
 from dataforge.logger import get_logger
 
 
+# Shared JSON Lines encoder. Calling the bound encode() of one reusable
+# encoder skips json.dumps() keyword handling on every line. Output is
+# compact (no spaces after separators) and keeps non-ASCII characters
+# as-is; lines are written as UTF-8.
+encode_json_line = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+# Units used by format_file_size(), in steps of 1024
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Read size for count_lines_in_file()
+LINE_COUNT_CHUNK_SIZE = 1 << 20
+
+
+def stat_path(path):
+    """
+    Get status of a path with a single stat() call.
+    
+    Lets callers check existence and file type together instead of
+    calling os.path.exists() and then os.path.isfile()/isdir(), which
+    stat the path once each.
+    
+    Args:
+        path (str): Path to check
+    
+    Returns:
+        os.stat_result: Status of the path, or None if it does not exist
+            or cannot be accessed
+    
+    Example:
+        >>> st = stat_path('./output')
+        >>> st is not None and stat.S_ISDIR(st.st_mode)
+        True
+    """
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
 def is_json_file(schema_string):
     """
     Check if the provided string is a path to a JSON file or a JSON string.
@@ -25,9 +65,14 @@ def is_json_file(schema_string):
         >>> is_json_file('{"key": "value"}')
         False
     """
+    # Inline JSON objects/arrays: no need to scan the string or stat it
+    if schema_string.lstrip()[:1] in ('{', '['):
+        return False
+    
     # Check if it looks like a file path
     if schema_string.endswith('.json') or '/' in schema_string or '\\' in schema_string:
-        return os.path.exists(schema_string) and os.path.isfile(schema_string)
+        st = stat_path(schema_string)
+        return st is not None and stat.S_ISREG(st.st_mode)
     return False
 
 
@@ -50,23 +95,26 @@ def load_json_from_file(file_path):
     logger = get_logger()
     
     # Check if file exists
-    if not os.path.exists(file_path):
+    st = stat_path(file_path)
+    if st is None:
         logger.error(f"File not found: {file_path}")
         sys.exit(1)
     
-    if not os.path.isfile(file_path):
+    if not stat.S_ISREG(st.st_mode):
         logger.error(f"Path is not a file: {file_path}")
         sys.exit(1)
     
-    # Try to read and parse JSON
+    # Try to read and parse JSON. The raw bytes go straight to json.loads,
+    # which decodes them in one step (also accepting a UTF-8 BOM) instead
+    # of through a text-mode reader
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = json.loads(f.read())
         
         logger.info(f"Loaded JSON from file: {file_path}")
         return data
     
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         logger.error(f"Invalid JSON in file '{file_path}': {e}")
         sys.exit(1)
     
@@ -175,8 +223,9 @@ def ensure_directory_exists(path):
     path = os.path.expanduser(path)
     
     # If path already exists
-    if os.path.exists(path):
-        if os.path.isdir(path):
+    st = stat_path(path)
+    if st is not None:
+        if stat.S_ISDIR(st.st_mode):
             return True
         else:
             logger.error(f"Path exists but is not a directory: {path}")
@@ -215,12 +264,13 @@ def validate_file_path(path):
     path = os.path.abspath(os.path.expanduser(path))
     
     # Check if exists
-    if not os.path.exists(path):
+    st = stat_path(path)
+    if st is None:
         logger.error(f"Path does not exist: {path}")
         sys.exit(1)
     
     # Check if it's a directory
-    if not os.path.isdir(path):
+    if not stat.S_ISDIR(st.st_mode):
         logger.error(f"Path exists but is not a directory: {path}")
         sys.exit(1)
     
@@ -243,11 +293,10 @@ def format_file_size(size_bytes):
         >>> format_file_size(1048576)
         '1.00 MB'
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} PB"
+    # Each unit is 2**10 times the previous one, so the unit index is the
+    # number of whole 10-bit groups above the lowest bit
+    index = min((max(int(size_bytes), 1).bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * index)):.2f} {FILE_SIZE_UNITS[index]}"
 
 
 def get_absolute_path(path):
@@ -273,6 +322,10 @@ def count_lines_in_file(file_path):
     """
     Count number of lines in a file.
     
+    Counts newline bytes in large raw reads, so no line is decoded or
+    iterated over in Python. A last line without a trailing newline
+    still counts.
+    
     Args:
         file_path (str): Path to file
     
@@ -283,7 +336,22 @@ def count_lines_in_file(file_path):
         >>> count = count_lines_in_file('./data.json')
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return sum(1 for _ in f)
+        lines = 0
+        ends_with_newline = True
+        with open(file_path, 'rb', buffering=0) as f:
+            # One buffer per call, refilled in place; small files get a
+            # small one
+            size = os.fstat(f.fileno()).st_size
+            buffer = bytearray(min(LINE_COUNT_CHUNK_SIZE, size + 1))
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                lines += buffer.count(b'\n', 0, n)
+                ends_with_newline = buffer[n - 1] == 0x0A
     except (IOError, OSError):
         return 0
+    
+    if not ends_with_newline:
+        lines += 1
+    return lines
@@ -6,9 +6,21 @@ This module ensures all parameters are valid before data generation begins.
 """
 
 import os
+import stat
 import sys
 import json
 from dataforge.logger import get_logger
+from dataforge.utils import stat_path
+
+
+# Number of CPUs, looked up once; upper bound for the multiprocessing parameter
+CPU_COUNT = os.cpu_count() or 1
+
+# Characters not allowed in file names
+INVALID_FILE_NAME_CHARS = '/\\:*?"<>|'
+
+# Translation table deleting INVALID_FILE_NAME_CHARS
+_STRIP_INVALID_FILE_NAME_CHARS = str.maketrans('', '', INVALID_FILE_NAME_CHARS)
 
 
 def validate_path(path, must_exist=True):
@@ -36,18 +48,37 @@ def validate_path(path, must_exist=True):
     
     if must_exist:
         # Check if exists
-        if not os.path.exists(path):
+        st = stat_path(path)
+        if st is None:
             logger.error(f"Path does not exist: {path}")
             sys.exit(1)
         
         # Check if it's a directory
-        if not os.path.isdir(path):
+        if not stat.S_ISDIR(st.st_mode):
             logger.error(f"Path exists but is not a directory: {path}")
             sys.exit(1)
     
     return path
 
 
+def _require_int(value, name):
+    """
+    Check that a parameter is an integer.
+    
+    Uses an exact type check, so bools (a subclass of int) are rejected.
+    
+    Args:
+        value: Parameter value
+        name (str): Parameter name for the error message
+    
+    Raises:
+        SystemExit: If value is not an int
+    """
+    if type(value) is not int:
+        get_logger().error(f"{name} must be an integer, got: {type(value).__name__}")
+        sys.exit(1)
+
+
 def validate_files_count(files_count):
     """
     Validate files_count parameter.
@@ -69,9 +100,7 @@ def validate_files_count(files_count):
     """
     logger = get_logger()
     
-    if not isinstance(files_count, int):
-        logger.error(f"files_count must be an integer, got: {type(files_count).__name__}")
-        sys.exit(1)
+    _require_int(files_count, 'files_count')
     
     if files_count < 0:
         logger.error(f"files_count must be >= 0, got: {files_count}")
@@ -102,9 +131,7 @@ def validate_data_lines(data_lines):
     """
     logger = get_logger()
     
-    if not isinstance(data_lines, int):
-        logger.error(f"data_lines must be an integer, got: {type(data_lines).__name__}")
-        sys.exit(1)
+    _require_int(data_lines, 'data_lines')
     
     if data_lines <= 0:
         logger.error(f"data_lines must be > 0, got: {data_lines}")
@@ -136,16 +163,13 @@ def validate_multiprocessing(multiprocessing_count):
     """
     logger = get_logger()
     
-    if not isinstance(multiprocessing_count, int):
-        logger.error(f"multiprocessing must be an integer, got: {type(multiprocessing_count).__name__}")
-        sys.exit(1)
+    _require_int(multiprocessing_count, 'multiprocessing')
     
     if multiprocessing_count < 1:
         logger.error(f"multiprocessing must be >= 1, got: {multiprocessing_count}")
         sys.exit(1)
     
-    # Get CPU count
-    cpu_count = os.cpu_count() or 1
+    cpu_count = CPU_COUNT
     
     # Limit to CPU count if exceeds
     if multiprocessing_count > cpu_count:
@@ -183,12 +207,12 @@ def validate_file_name(file_name):
         logger.error("file_name cannot be empty")
         sys.exit(1)
     
-    # Check for invalid characters in filename
-    invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-    for char in invalid_chars:
-        if char in file_name:
-            logger.error(f"file_name contains invalid character '{char}': {file_name}")
-            sys.exit(1)
+    # Check for invalid characters in filename: one pass deleting them all,
+    # then find which one it was only if the length changed
+    if len(file_name.translate(_STRIP_INVALID_FILE_NAME_CHARS)) != len(file_name):
+        char = next(c for c in INVALID_FILE_NAME_CHARS if c in file_name)
+        logger.error(f"file_name contains invalid character '{char}': {file_name}")
+        sys.exit(1)
     
     return file_name
 
@@ -276,10 +300,29 @@ def validate_schema_basic(schema):
     sys.exit(1)
 
 
+# Parameters checked by validate_all_parameters(), in order, with the
+# condition under which each check applies (None: always)
+PARAMETER_VALIDATORS = (
+    ('files_count', validate_files_count, None),
+    # Path only matters when saving to files (files_count > 0)
+    ('path_to_save_files', validate_path,
+     lambda p: type(p['files_count']) is int and p['files_count'] > 0),
+    ('data_lines', validate_data_lines, None),
+    ('multiprocessing', validate_multiprocessing, None),
+    ('file_name', validate_file_name, None),
+    ('file_prefix', validate_file_prefix, None),
+    # Basic JSON check; detailed checks happen in schema_parser
+    ('data_schema', validate_schema_basic, lambda p: p.get('data_schema')),
+)
+
+
 def validate_all_parameters(params):
     """
     Validate all parameters at once.
     
+    Every parameter is checked before failing, so all invalid parameters
+    are reported in a single run.
+    
     Args:
         params (dict): Dictionary of all parameters
     
@@ -300,42 +343,21 @@ def validate_all_parameters(params):
     # Create a copy to avoid modifying original
     validated_params = params.copy()
     
-    # Validate path (only if files_count > 0, i.e., saving to files)
-    if validated_params['files_count'] > 0:
-        validated_params['path_to_save_files'] = validate_path(
-            validated_params['path_to_save_files']
-        )
-    
-    # Validate files_count
-    validated_params['files_count'] = validate_files_count(
-        validated_params['files_count']
-    )
-    
-    # Validate data_lines
-    validated_params['data_lines'] = validate_data_lines(
-        validated_params['data_lines']
-    )
-    
-    # Validate multiprocessing
-    validated_params['multiprocessing'] = validate_multiprocessing(
-        validated_params['multiprocessing']
-    )
-    
-    # Validate file_name
-    validated_params['file_name'] = validate_file_name(
-        validated_params['file_name']
-    )
-    
-    # Validate file_prefix
-    validated_params['file_prefix'] = validate_file_prefix(
-        validated_params['file_prefix']
-    )
-    
-    # Validate schema (basic JSON check)
-    if validated_params.get('data_schema'):
-        validated_params['data_schema'] = validate_schema_basic(
-            validated_params['data_schema']
-        )
+    # Each validator logs its own error and exits; catch that exit so the
+    # remaining parameters are still checked, then exit once at the end
+    failed = []
+    
+    for key, validator, applies in PARAMETER_VALIDATORS:
+        if applies is not None and not applies(validated_params):
+            continue
+        try:
+            validated_params[key] = validator(validated_params[key])
+        except SystemExit:
+            failed.append(key)
+    
+    if failed:
+        logger.error(f"Invalid parameter(s): {', '.join(failed)}")
+        sys.exit(1)
     
     logger.info("All parameters validated successfully")
     
@@ -3,6 +3,95 @@ Pytest configuration and fixtures
 """
 
 import pytest
+import json
+from dataforge.data_generator import create_generator
 
-# TODO: Add common fixtures here
 
+def pytest_addoption(parser):
+    """Add command line options"""
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="also run tests marked slow"
+    )
+
+
+def pytest_configure(config):
+    """Register custom markers"""
+    config.addinivalue_line(
+        "markers",
+        "serial: test starts its own worker processes; run it outside "
+        "pytest -n (pytest -m serial) to avoid oversubscribing CPUs"
+    )
+    config.addinivalue_line(
+        "markers",
+        "slow: heavy regression test; skipped unless --runslow is given"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow is given"""
+    if config.getoption("--runslow"):
+        return
+    
+    skip_slow = pytest.mark.skip(reason="slow test; use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+# ================ Shared Fixtures ================
+#
+# Session-scoped: built once per test run and shared, so tests must not
+# modify them
+
+@pytest.fixture(scope="session")
+def test_generator():
+    """Create a simple generator for testing"""
+    schema = {
+        'id': {'type': 'int', 'strategy': 'rand', 'value': None},
+        'name': {'type': 'str', 'strategy': 'rand', 'value': None}
+    }
+    return create_generator(schema)
+
+
+@pytest.fixture(scope="session")
+def test_schema_simple():
+    """Simple schema for testing"""
+    return {
+        "id": "int:rand",
+        "name": "str:rand"
+    }
+
+
+@pytest.fixture(scope="session")
+def test_schema_complex():
+    """Complex schema with all field types"""
+    return {
+        "id": "int:rand",
+        "timestamp": "timestamp:",
+        "username": "str:rand",
+        "age": "int:rand(18,65)",
+        "status": "str:[active,inactive,pending]",
+        "priority": "int:[1,2,3,4,5]",
+        "email": "str:test@example.com",
+        "count": "int:100",
+        "description": "str:"
+    }
+
+
+@pytest.fixture(scope="session")
+def schema_file(tmp_path_factory, test_schema_simple):
+    """Create a temporary schema file"""
+    schema_path = tmp_path_factory.mktemp("schema") / "schema.json"
+    with open(schema_path, 'w') as f:
+        json.dump(test_schema_simple, f)
+    return str(schema_path)
+
+
+@pytest.fixture(scope="session")
+def read_jsonl():
+    """Return a function reading a JSON Lines file into a list of records"""
+    def read(path):
+        with open(path, 'rb') as f:
+            return [json.loads(line) for line in f.read().splitlines() if line]
+    return read
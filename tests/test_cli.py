@@ -4,11 +4,20 @@ Tests for CLI module
 
 import pytest
 import sys
+import logging
 from io import StringIO
-from dataforge.cli import create_parser, parse_arguments, display_parameters
+from dataforge.cli import create_parser, parse_arguments, fast_parse_arguments, display_parameters
 from dataforge.logger import setup_logger
 
 
+# ================ Fixtures ================
+
+@pytest.fixture(scope="module")
+def parser():
+    """Argument parser shared by the tests in this module (it is not modified)"""
+    return create_parser()
+
+
 def test_create_parser():
     """Test parser creation"""
     parser = create_parser()
@@ -166,6 +175,26 @@ def test_display_parameters_long_schema(capsys):
         assert '...' in output
 
 
+def test_display_parameters_quiet_logger(capsys):
+    """Test that display_parameters outputs nothing above INFO level"""
+    logger = setup_logger('test_display_quiet', level=logging.WARNING)
+    
+    params = {
+        'path_to_save_files': '.',
+        'files_count': 1,
+        'file_name': 'data',
+        'file_prefix': 'count',
+        'data_lines': 100,
+        'multiprocessing': 1,
+        'clear_path': False,
+        'data_schema': {'id': 'int:rand'}
+    }
+    
+    display_parameters(logger, params)
+    
+    assert capsys.readouterr().out == ''
+
+
 def test_parse_arguments_with_equals_sign():
     """Test parsing arguments with equals sign format"""
     args = parse_arguments([
@@ -195,9 +224,8 @@ def test_parse_arguments_mixed_formats():
     assert args.data_lines == 100
 
 
-def test_parser_help_contains_examples():
+def test_parser_help_contains_examples(parser):
     """Test that parser help contains usage examples"""
-    parser = create_parser()
     help_text = parser.format_help()
     
     assert 'Examples:' in help_text
@@ -245,3 +273,32 @@ def test_parse_arguments_current_directory():
     args = parse_arguments(['.'])
     assert args.path_to_save_files == '.'
 
+
+@pytest.mark.parametrize("argv", [
+    ['.'],
+    ['./output', '--files_count=5', '--file_name', 'test', '--data_lines=100'],
+    ['/tmp/out', '--clear_path', '--file_prefix', 'uuid', '--multiprocessing', '2'],
+    ['.', '--data_schema', '{"id": "int:rand"}', '--files_count', '0'],
+])
+def test_fast_parse_arguments_matches_argparse(parser, argv):
+    """Test that the fast parser produces the same values as argparse"""
+    fast = fast_parse_arguments(argv)
+    full = parser.parse_args(argv)
+    
+    assert fast is not None
+    assert vars(fast) == vars(full)
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ['--help'],
+    ['.', 'extra'],
+    ['.', '--files_count', 'abc'],
+    ['.', '--files_count', '-1'],
+    ['.', '--file_prefix=invalid'],
+    ['.', '--clear_path=yes'],
+    ['.', '--files', '3'],
+])
+def test_fast_parse_arguments_falls_back(argv):
+    """Test that the fast parser defers unusual command lines to argparse"""
+    assert fast_parse_arguments(argv) is None
@@ -199,3 +199,20 @@ def test_merge_config_with_args_all_cli():
     assert params['multiprocessing'] == 4
     assert params['clear_path'] is True
 
+
+
+def test_merge_config_with_args_accepts_dict():
+    """Test merging when args are given as a plain dict"""
+    config = get_hardcoded_defaults()
+    
+    params = merge_config_with_args(config, {
+        'path_to_save_files': '/tmp/data',
+        'files_count': 3,
+        'data_lines': None
+    })
+    
+    assert params['path_to_save_files'] == '/tmp/data'
+    assert params['files_count'] == 3
+    assert params['data_lines'] == 1000
+    assert params['file_name'] == 'generated_data'
+    assert params['clear_path'] is False
@@ -4,18 +4,25 @@ Tests for data_generator module
 
 import pytest
 import json
+import random
+import sys
 import time
 from dataforge.data_generator import (
     DataGenerator,
     generate_timestamp,
     generate_str_rand,
+    generate_str_rand_column,
     generate_int_rand,
     generate_from_list,
     generate_int_range,
     generate_static,
     generate_empty,
-    create_generator
+    compile_line_builder,
+    intern_value,
+    create_generator,
+    seed
 )
+from dataforge.utils import encode_json_line
 
 
 # ================ Generator functions tests ================
@@ -44,6 +51,26 @@ def test_generate_str_rand():
     assert s != s2  # Very unlikely to be the same
 
 
+def test_generate_str_rand_column():
+    """Test batch random string generation"""
+    column = generate_str_rand_column(100)
+    
+    assert len(column) == 100
+    assert all(len(s) == 8 for s in column)
+    assert all(c in '0123456789abcdef' for s in column for c in s)
+    assert len(set(column)) >= 95
+
+
+@pytest.mark.parametrize("use_secure", [False, True])
+def test_generate_str_rand_sources(use_secure):
+    """Test random strings from both the PRNG and os.urandom()"""
+    values = [generate_str_rand(use_secure=use_secure) for _ in range(50)]
+    values += generate_str_rand_column(50, use_secure=use_secure)
+    
+    assert all(len(s) == 8 and int(s, 16) >= 0 for s in values)
+    assert len(set(values)) >= 95
+
+
 def test_generate_int_rand():
     """Test random integer generation"""
     n = generate_int_rand()
@@ -116,6 +143,16 @@ def test_generate_int_range_distribution():
     assert len(unique_values) >= 3  # At least 3 out of 5 values
 
 
+def test_generate_int_range_empty_range():
+    """Test that a range with max < min raises instead of looping forever"""
+    with pytest.raises(ValueError):
+        generate_int_range(5, 1)
+    
+    schema = {'a': {'type': 'int', 'strategy': 'range', 'value': (5, 1)}}
+    with pytest.raises(ValueError):
+        DataGenerator(schema).generate_line()
+
+
 @pytest.mark.parametrize("value,expected", [
     ("hello", "hello"),
     (42, 42),
@@ -145,6 +182,21 @@ def test_generate_empty_other():
     assert result is None
 
 
+def test_seed_makes_helpers_reproducible():
+    """Test that seeding repeats the module-level helpers' values"""
+    def draw():
+        return (generate_int_rand(), generate_int_range(1, 5),
+                generate_str_rand(), generate_from_list(['a', 'b', 'c']))
+    
+    seed(42)
+    first = [draw() for _ in range(10)]
+    seed(42)
+    second = [draw() for _ in range(10)]
+    seed()
+    
+    assert first == second
+
+
 # ================ DataGenerator class tests ================
 
 def test_data_generator_init():
@@ -255,6 +307,20 @@ def test_generate_line_int_range():
     assert 18 <= line['age'] <= 65
 
 
+@pytest.mark.parametrize("min_val,max_val", [(18, 65), (7, 7), (-10, 10)])
+def test_int_range_field_matches_randint(min_val, max_val):
+    """Test that seeded int ranges draw the same values as Random.randint"""
+    schema = {
+        'age': {'type': 'int', 'strategy': 'range', 'value': (min_val, max_val)}
+    }
+    
+    gen = DataGenerator(schema, seed=42)
+    expected_rng = random.Random(42)
+    
+    for _ in range(50):
+        assert gen.generate_line()['age'] == expected_rng.randint(min_val, max_val)
+
+
 def test_generate_line_int_list():
     """Test generating line with integer from list"""
     schema = {
@@ -325,6 +391,62 @@ def test_generate_line_complex_schema():
     assert line['count'] == 10
 
 
+def test_generated_strings_are_interned():
+    """Test that list and static strings come out interned"""
+    schema = {
+        'status': {'type': 'str', 'strategy': 'list', 'value': [''.join(['act', 'ive'])]},
+        'name': {'type': 'str', 'strategy': 'static', 'value': ''.join(['fi', 'xed'])}
+    }
+    
+    line = DataGenerator(schema).generate_line()
+    
+    assert line['status'] is sys.intern('active')
+    assert line['name'] is sys.intern('fixed')
+    assert intern_value((1, 5)) == (1, 5)
+
+
+def test_generate_lines_encoded_matches_generate_lines():
+    """Test that encoded lines equal encoding generated rows"""
+    schema = {
+        'id': {'type': 'int', 'strategy': 'rand', 'value': None},
+        'age': {'type': 'int', 'strategy': 'range', 'value': (-5, 5)},
+        'name"%s': {'type': 'str', 'strategy': 'rand', 'value': None},
+        'status': {'type': 'str', 'strategy': 'list', 'value': ['active', 'ünï"']},
+        'flag': {'type': 'int', 'strategy': 'static', 'value': 7},
+        'note': {'type': 'str', 'strategy': 'empty', 'value': None}
+    }
+    
+    rows = DataGenerator(schema, seed=3).generate_lines(200)
+    encoded = DataGenerator(schema, seed=3).generate_lines_encoded(200)
+    
+    assert encoded == [(encode_json_line(row) + '\n').encode('utf-8') for row in rows]
+
+
+def test_generate_lines_encoded_timestamp_and_empty_schema():
+    """Test encoded timestamps parse back and empty schemas give {}"""
+    schema = {'ts': {'type': 'timestamp', 'strategy': 'rand', 'value': None}}
+    
+    lines = DataGenerator(schema).generate_lines_encoded(3)
+    
+    assert all(isinstance(json.loads(line)['ts'], float) for line in lines)
+    assert DataGenerator({}).generate_lines_encoded(2) == [b'{}\n', b'{}\n']
+    assert [len(batch) for batch in DataGenerator(schema).iter_encoded_batches(10, batch_size=4)] == [4, 4, 2]
+
+
+def test_generate_columns():
+    """Test generating lines as columns"""
+    schema = {
+        'id': {'type': 'int', 'strategy': 'rand', 'value': None},
+        'status': {'type': 'str', 'strategy': 'static', 'value': 'ok'}
+    }
+    
+    columns = DataGenerator(schema).generate_columns(5)
+    
+    assert list(columns) == ['id', 'status']
+    assert len(columns['id']) == 5
+    assert columns['status'] == ['ok'] * 5
+
+
 def test_generate_lines_count():
     """Test generating multiple lines"""
     schema = {
@@ -341,6 +463,20 @@ def test_generate_lines_count():
     assert all(isinstance(line['id'], int) for line in lines)
 
 
+def test_iter_batches_sizes():
+    """Test that iter_batches yields bounded batches covering the count"""
+    schema = {
+        'id': {'type': 'int', 'strategy': 'rand', 'value': None}
+    }
+    
+    gen = DataGenerator(schema)
+    batches = list(gen.iter_batches(10, batch_size=4))
+    
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert all(isinstance(line['id'], int) for batch in batches for line in batch)
+    assert list(gen.iter_batches(0)) == []
+
+
 def test_generate_lines_variety():
     """Test that multiple lines have variety"""
     schema = {
@@ -360,6 +496,39 @@ def test_generate_lines_variety():
     assert len(set(names)) >= 40  # At least 40 unique names out of 50
 
 
+def test_generate_lines_int_range_bounds():
+    """Test that batch int range columns stay within inclusive bounds"""
+    schema = {
+        'small': {'type': 'int', 'strategy': 'range', 'value': (1, 3)},
+        'wide': {'type': 'int', 'strategy': 'range', 'value': (0, 2 ** 40)}
+    }
+    
+    gen = DataGenerator(schema)
+    lines = gen.generate_lines(200)
+    
+    small = {line['small'] for line in lines}
+    assert small == {1, 2, 3}
+    assert all(0 <= line['wide'] <= 2 ** 40 for line in lines)
+
+
+def test_seeded_generators_reproducible():
+    """Test that generators with the same seed produce the same data"""
+    schema = {
+        'id': {'type': 'int', 'strategy': 'rand', 'value': None},
+        'name': {'type': 'str', 'strategy': 'rand', 'value': None},
+        'age': {'type': 'int', 'strategy': 'range', 'value': (18, 65)},
+        'status': {'type': 'str', 'strategy': 'list', 'value': ['a', 'b', 'c']}
+    }
+    
+    gen1 = DataGenerator(schema, seed=42)
+    gen2 = DataGenerator(schema, seed=42)
+    gen3 = DataGenerator(schema, seed=7)
+    
+    assert gen1.generate_lines(20) == gen2.generate_lines(20)
+    assert gen1.generate_line() == gen2.generate_line()
+    assert DataGenerator(schema, seed=42).generate_lines(20) != gen3.generate_lines(20)
+
+
 def test_generate_line_json():
     """Test generating line as JSON string"""
     schema = {
@@ -399,6 +568,30 @@ def test_generate_line_json_complex():
     assert 'name' in parsed
 
 
+def test_unknown_field_strategy_generates_none():
+    """Test that an unsupported type/strategy combination yields None"""
+    schema = {
+        'count': {'type': 'int', 'strategy': 'empty', 'value': None}
+    }
+    
+    gen = DataGenerator(schema)
+    
+    assert gen.generate_line() == {'count': None}
+    assert gen.generate_lines(3) == [{'count': None}] * 3
+
+
+def test_compile_line_builder():
+    """Test compiled line builders, including awkward field names"""
+    counter = iter(range(10))
+    fields = (('id', lambda: next(counter)), ('it\'s "quoted"\\', lambda: 'x'))
+    
+    build_line = compile_line_builder(fields)
+    
+    assert build_line() == {'id': 0, 'it\'s "quoted"\\': 'x'}
+    assert build_line() == {'id': 1, 'it\'s "quoted"\\': 'x'}
+    assert compile_line_builder(())() == {}
+
+
 # ================ Consistency tests ================
 
 def test_static_values_consistent():
@@ -448,6 +641,25 @@ def test_create_generator_function():
     assert gen.parsed_schema == schema
 
 
+def test_create_generator_reuses_generator_for_same_schema():
+    """Test that create_generator caches generators by schema content"""
+    schema = {
+        'status': {'type': 'str', 'strategy': 'list', 'value': ['on', 'off']}
+    }
+    same_schema = {
+        'status': {'type': 'str', 'strategy': 'list', 'value': ['on', 'off']}
+    }
+    other_schema = {
+        'status': {'type': 'str', 'strategy': 'list', 'value': ['yes', 'no']}
+    }
+    
+    gen = create_generator(schema)
+    
+    assert create_generator(same_schema) is gen
+    assert create_generator(other_schema) is not gen
+    assert create_generator(schema, seed=1) is not gen
+
+
 def test_end_to_end_generation():
     """Test end-to-end generation process"""
     # Simulate a typical schema
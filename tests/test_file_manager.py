@@ -5,17 +5,18 @@ Tests for file_manager module
 import pytest
 import os
 import json
-import glob
+from pathlib import Path
 from dataforge.file_manager import (
     generate_file_name,
     write_jsonlines,
+    write_jsonlines_batches,
+    shard_index_path,
     write_to_console,
     clear_directory,
     create_single_file,
     create_multiple_files,
     get_file_stats
 )
-from dataforge.data_generator import create_generator
 
 
 # ================ Fixtures ================
@@ -30,14 +31,9 @@ def sample_data():
     ]
 
 
-@pytest.fixture
-def test_generator():
-    """Create a simple generator for testing"""
-    schema = {
-        'id': {'type': 'int', 'strategy': 'rand', 'value': None},
-        'name': {'type': 'str', 'strategy': 'rand', 'value': None}
-    }
-    return create_generator(schema)
+# Lowercase hex alphabet; bytes.translate(None, HEX_DIGITS) leaves only
+# the characters outside it
+HEX_DIGITS = b'0123456789abcdef'
 
 
 # ================ generate_file_name tests ================
@@ -59,7 +55,7 @@ def test_generate_file_name_random():
     assert name.endswith('_data.json')
     prefix = name.split('_')[0]
     assert len(prefix) == 6
-    assert all(c in '0123456789abcdef' for c in prefix)
+    assert prefix.encode().translate(None, HEX_DIGITS) == b''
 
 
 def test_generate_file_name_uuid():
@@ -85,20 +81,16 @@ def test_generate_file_name_invalid_prefix():
     assert exc_info.value.code == 1
 
 
-def test_generate_file_name_uniqueness():
+@pytest.mark.parametrize("prefix_type", ['random', 'uuid'])
+def test_generate_file_name_uniqueness(prefix_type):
     """Test that random and UUID prefixes generate unique names"""
-    # Random prefixes
-    names_random = [generate_file_name('data', 'random', 0) for _ in range(10)]
-    assert len(set(names_random)) == 10  # All unique
-    
-    # UUID prefixes
-    names_uuid = [generate_file_name('data', 'uuid', 0) for _ in range(10)]
-    assert len(set(names_uuid)) == 10  # All unique
+    names = [generate_file_name('data', prefix_type, 0) for _ in range(10)]
+    assert len(set(names)) == 10  # All unique
 
 
 # ================ write_jsonlines tests ================
 
-def test_write_jsonlines_basic(tmp_path, sample_data):
+def test_write_jsonlines_basic(tmp_path, sample_data, read_jsonl):
     """Test basic JSON Lines writing"""
     filepath = tmp_path / "test.json"
     
@@ -107,16 +99,8 @@ def test_write_jsonlines_basic(tmp_path, sample_data):
     # File should exist
     assert filepath.exists()
     
-    # Read and verify content
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-    
-    assert len(lines) == 3
-    
-    # Each line should be valid JSON
-    for i, line in enumerate(lines):
-        data = json.loads(line.strip())
-        assert data == sample_data[i]
+    # Read and verify content; each line should be valid JSON
+    assert read_jsonl(filepath) == sample_data
 
 
 def test_write_jsonlines_empty(tmp_path):
@@ -138,13 +122,39 @@ def test_write_jsonlines_single_line(tmp_path):
     
     write_jsonlines(str(filepath), data)
     
-    with open(filepath, 'r') as f:
-        content = f.read().strip()
+    assert filepath.read_bytes() == b'{"id":1,"value":"test"}\n'
+
+
+def test_write_jsonlines_batches(tmp_path, sample_data, read_jsonl):
+    """Test streaming batches into a JSON Lines file"""
+    filepath = tmp_path / "batches.json"
+    batches = (batch for batch in [sample_data[:2], [], sample_data[2:]])
+    
+    write_jsonlines_batches(str(filepath), batches)
+    
+    assert read_jsonl(filepath) == sample_data
+
+
+def test_write_jsonlines_batches_encoded(tmp_path):
+    """Test that already encoded lines are written as-is"""
+    filepath = tmp_path / "encoded.json"
+    
+    write_jsonlines_batches(str(filepath), [[b'{"id":1}\n', b'{"id":2}\n'], [b'{"id":3}\n']])
+    
+    assert filepath.read_bytes() == b'{"id":1}\n{"id":2}\n{"id":3}\n'
+
+
+def test_write_jsonlines_many_lines(tmp_path, read_jsonl):
+    """Test writing more lines than fit in a single vectored write"""
+    filepath = tmp_path / "many.json"
+    data = [{'id': i} for i in range(1500)]
+    
+    write_jsonlines(str(filepath), data)
     
-    assert content == '{"id": 1, "value": "test"}'
+    assert read_jsonl(filepath) == data
 
 
-def test_write_jsonlines_special_characters(tmp_path):
+def test_write_jsonlines_special_characters(tmp_path, read_jsonl):
     """Test writing data with special characters"""
     filepath = tmp_path / "special.json"
     data = [
@@ -156,12 +166,7 @@ def test_write_jsonlines_special_characters(tmp_path):
     write_jsonlines(str(filepath), data)
     
     # Should be able to read back
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-    
-    for i, line in enumerate(lines):
-        parsed = json.loads(line.strip())
-        assert parsed == data[i]
+    assert read_jsonl(filepath) == data
 
 
 # ================ write_to_console tests ================
@@ -171,14 +176,11 @@ def test_write_to_console(capsys, sample_data):
     write_to_console(sample_data)
     
     captured = capsys.readouterr()
-    lines = captured.out.strip().split('\n')
     
-    assert len(lines) == 3
-    
-    # Each line should be valid JSON
-    for i, line in enumerate(lines):
-        data = json.loads(line)
-        assert data == sample_data[i]
+    # One JSON value per line
+    lines = captured.out.splitlines()
+    assert len(lines) == len(sample_data)
+    assert [json.loads(line) for line in lines] == sample_data
 
 
 def test_write_to_console_empty(capsys):
@@ -195,10 +197,10 @@ def test_write_to_console_empty(capsys):
 def test_clear_directory_basic(tmp_path):
     """Test clearing directory with JSON files"""
     # Create some test files
-    (tmp_path / "1_data.json").write_text('{"id": 1}')
-    (tmp_path / "2_data.json").write_text('{"id": 2}')
-    (tmp_path / "3_data.json").write_text('{"id": 3}')
-    (tmp_path / "readme.txt").write_text('Not a JSON file')
+    (tmp_path / "1_data.json").write_bytes(b'{"id": 1}')
+    (tmp_path / "2_data.json").write_bytes(b'{"id": 2}')
+    (tmp_path / "3_data.json").write_bytes(b'{"id": 3}')
+    (tmp_path / "readme.txt").write_bytes(b'Not a JSON file')
     
     # Clear JSON files
     removed = clear_directory(str(tmp_path), '*.json')
@@ -223,7 +225,7 @@ def test_clear_directory_empty(tmp_path):
 
 def test_clear_directory_no_matches(tmp_path):
     """Test clearing directory with no matching files"""
-    (tmp_path / "file.txt").write_text('test')
+    (tmp_path / "file.txt").write_bytes(b'test')
     
     removed = clear_directory(str(tmp_path), '*.json')
     
@@ -233,9 +235,9 @@ def test_clear_directory_no_matches(tmp_path):
 
 def test_clear_directory_custom_pattern(tmp_path):
     """Test clearing with custom pattern"""
-    (tmp_path / "data.json").write_text('{}')
-    (tmp_path / "backup.bak").write_text('{}')
-    (tmp_path / "log.txt").write_text('{}')
+    (tmp_path / "data.json").write_bytes(b'{}')
+    (tmp_path / "backup.bak").write_bytes(b'{}')
+    (tmp_path / "log.txt").write_bytes(b'{}')
     
     # Clear only .bak files
     removed = clear_directory(str(tmp_path), '*.bak')
@@ -246,6 +248,45 @@ def test_clear_directory_custom_pattern(tmp_path):
     assert (tmp_path / "log.txt").exists()
 
 
+def test_clear_directory_skips_hidden_and_directories(tmp_path):
+    """Test that hidden files and subdirectories are left alone"""
+    (tmp_path / "data.json").write_bytes(b'{}')
+    (tmp_path / ".hidden.json").write_bytes(b'{}')
+    (tmp_path / "nested.json").mkdir()
+    (tmp_path / "part_1.json").write_bytes(b'{}')
+    
+    assert clear_directory(str(tmp_path), 'part_?.json') == 1
+    assert clear_directory(str(tmp_path), '*.json') == 1
+    
+    assert (tmp_path / ".hidden.json").exists()
+    assert (tmp_path / "nested.json").is_dir()
+
+
+def test_clear_directory_removes_symlinks_to_files(tmp_path):
+    """Test that a matching symlink to a file is removed, not its target"""
+    target = tmp_path / "target.txt"
+    target.write_bytes(b'{}')
+    (tmp_path / "link.json").symlink_to(target)
+    
+    assert clear_directory(str(tmp_path)) == 1
+    
+    assert not (tmp_path / "link.json").is_symlink()
+    assert target.exists()
+
+
+def test_clear_directory_pattern_with_subdirectory(tmp_path):
+    """Test that a pattern with a directory part matches inside that directory"""
+    subdir = tmp_path / "sub"
+    subdir.mkdir()
+    (subdir / "data.json").write_bytes(b'{}')
+    (tmp_path / "top.json").write_bytes(b'{}')
+    
+    assert clear_directory(str(tmp_path), 'sub/*.json') == 1
+    
+    assert not (subdir / "data.json").exists()
+    assert (tmp_path / "top.json").exists()
+
+
 def test_clear_directory_nonexistent():
     """Test clearing non-existent directory"""
     with pytest.raises(SystemExit) as exc_info:
@@ -281,52 +322,29 @@ def test_create_single_file_basic(tmp_path, sample_data):
     assert os.path.exists(filepath)
     
     # Verify content
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-    
-    assert len(lines) == 3
+    assert Path(filepath).read_bytes().count(b'\n') == 3
 
 
-def test_create_single_file_different_prefixes(tmp_path):
+@pytest.mark.parametrize("prefix_type,index,expected_in_name", [
+    ('count', 5, '5_data.json'),
+    ('random', 0, '_data.json'),
+    ('uuid', 0, '-'),  # UUID has dashes
+])
+def test_create_single_file_different_prefixes(tmp_path, prefix_type, index, expected_in_name):
     """Test creating files with different prefix types"""
-    data = [{'id': 1}]
-    
-    # Count prefix
-    params_count = {
+    params = {
         'path': str(tmp_path),
         'file_name': 'data',
-        'prefix_type': 'count',
-        'index': 5,
-        'data': data
+        'prefix_type': prefix_type,
+        'index': index,
+        'data': [{'id': 1}]
     }
-    filepath_count = create_single_file(params_count)
-    assert '5_data.json' in filepath_count
-    assert os.path.exists(filepath_count)
     
-    # Random prefix
-    params_random = {
-        'path': str(tmp_path),
-        'file_name': 'data',
-        'prefix_type': 'random',
-        'index': 0,
-        'data': data
-    }
-    filepath_random = create_single_file(params_random)
-    assert '_data.json' in filepath_random
-    assert os.path.exists(filepath_random)
+    filepath = create_single_file(params)
     
-    # UUID prefix
-    params_uuid = {
-        'path': str(tmp_path),
-        'file_name': 'data',
-        'prefix_type': 'uuid',
-        'index': 0,
-        'data': data
-    }
-    filepath_uuid = create_single_file(params_uuid)
-    assert '_data.json' in filepath_uuid
-    assert '-' in filepath_uuid  # UUID has dashes
-    assert os.path.exists(filepath_uuid)
+    assert os.path.basename(filepath).endswith('_data.json')
+    assert expected_in_name in os.path.basename(filepath)
+    assert os.path.exists(filepath)
 
 
 # ================ create_multiple_files tests ================
@@ -350,24 +368,20 @@ def test_create_multiple_files_basic(tmp_path, test_generator):
         assert f'{i}_data.json' in filepath
         
         # Check each file has 5 lines
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        assert len(lines) == 5
+        assert Path(filepath).read_bytes().count(b'\n') == 5
 
 
-def test_create_multiple_files_different_counts(tmp_path, test_generator):
+def test_create_multiple_files_different_counts(tmp_path_factory, test_generator):
     """Test creating different number of files"""
     # Single file
-    set1_path = tmp_path / 'set1'
-    os.makedirs(str(set1_path), exist_ok=True)
+    set1_path = tmp_path_factory.mktemp('set1')
     files_1 = create_multiple_files(
         str(set1_path), 'data', 'count', 1, 10, test_generator
     )
     assert len(files_1) == 1
     
     # Multiple files
-    set2_path = tmp_path / 'set2'
-    os.makedirs(str(set2_path), exist_ok=True)
+    set2_path = tmp_path_factory.mktemp('set2')
     files_10 = create_multiple_files(
         str(set2_path), 'data', 'count', 10, 5, test_generator
     )
@@ -406,6 +420,34 @@ def test_create_multiple_files_uuid_prefix(tmp_path, test_generator):
         assert '-' in basename  # UUIDs have dashes
 
 
+def test_create_multiple_files_sharded(tmp_path, test_generator):
+    """Test grouping logical files into shards with an index"""
+    files = create_multiple_files(
+        str(tmp_path), 'data', 'count', 5, 4, test_generator, shard_size=2
+    )
+    
+    assert [os.path.basename(f) for f in files] == ['1_data.json', '2_data.json', '3_data.json']
+    
+    for filepath, parts in zip(files, [2, 2, 1]):
+        with open(shard_index_path(filepath), 'r') as f:
+            index = json.load(f)
+        with open(filepath, 'rb') as f:
+            content = f.read()
+        
+        assert [entry['lines'] for entry in index] == [4] * parts
+        assert len(content.splitlines()) == 4 * parts
+        
+        # Each offset points at the first line of its logical file
+        for entry in index:
+            first_line = content[entry['offset']:].split(b'\n', 1)[0]
+            assert 'id' in json.loads(first_line)
+    
+    # Index files do not match '*.json' but are cleared with their shards
+    assert all(shard_index_path(f).endswith('.idx') for f in files)
+    assert clear_directory(str(tmp_path), '*.json') == 3
+    assert os.listdir(tmp_path) == []
+
+
 # ================ get_file_stats tests ================
 
 def test_get_file_stats_existing(tmp_path, sample_data):
@@ -420,6 +462,14 @@ def test_get_file_stats_existing(tmp_path, sample_data):
     assert stats['lines'] == 3
 
 
+def test_get_file_stats_no_trailing_newline(tmp_path):
+    """Test that a last line without a newline is counted"""
+    filepath = tmp_path / "data.json"
+    filepath.write_bytes(b'{"id": 1}\n{"id": 2}')
+    
+    assert get_file_stats(str(filepath))['lines'] == 2
+
+
 def test_get_file_stats_nonexistent():
     """Test getting stats for non-existent file"""
     stats = get_file_stats('/nonexistent/file.json')
@@ -478,12 +528,12 @@ def test_multiple_file_sets_in_same_directory(tmp_path, test_generator):
     assert len(files2) == 2
     
     # Check files
-    json_files = glob.glob(os.path.join(path, '*.json'))
+    json_files = list(tmp_path.glob('*.json'))
     assert len(json_files) == 4
     
     # Should have both set1 and set2 files
-    set1_files = [f for f in json_files if 'set1' in f]
-    set2_files = [f for f in json_files if 'set2' in f]
+    set1_files = [f for f in json_files if 'set1' in f.name]
+    set2_files = [f for f in json_files if 'set2' in f.name]
     assert len(set1_files) == 2
     assert len(set2_files) == 2
 
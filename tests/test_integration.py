@@ -6,65 +6,62 @@ Tests the complete workflow of the DataForge utility.
 import pytest
 import os
 import json
+import logging
 import subprocess
-import glob
+from dataforge.cli import main
 
 
-# ================ Fixtures ================
+# Command line pieces shared by many tests
+MODULE_COMMAND = ('python3', '-m', 'dataforge')
+SCHEMA_ID_ARG = '--data_schema={"id":"int:rand"}'
+SCHEMA_SIMPLE_ARG = '--data_schema={"id":"int:rand","name":"str:rand"}'
 
-@pytest.fixture
-def test_schema_simple():
-    """Simple schema for testing"""
-    return {
-        "id": "int:rand",
-        "name": "str:rand"
-    }
 
+# ================ Helpers ================
 
-@pytest.fixture
-def test_schema_complex():
-    """Complex schema with all field types"""
-    return {
-        "id": "int:rand",
-        "timestamp": "timestamp:",
-        "username": "str:rand",
-        "age": "int:rand(18,65)",
-        "status": "str:[active,inactive,pending]",
-        "priority": "int:[1,2,3,4,5]",
-        "email": "str:test@example.com",
-        "count": "int:100",
-        "description": "str:"
-    }
+def run_cli(capsys, *args):
+    """Run the CLI in-process and capture its exit code and stdout"""
+    # main() rebinds the logger's handlers to the captured stdout, which
+    # is closed after the test; restore them for later tests
+    logger = logging.getLogger('dataforge')
+    handlers, level = logger.handlers[:], logger.level
+    
+    try:
+        returncode = main(list(args))
+    except SystemExit as e:
+        returncode = e.code
+    finally:
+        logger.handlers = handlers
+        logger.setLevel(level)
+    
+    return subprocess.CompletedProcess(args, returncode, stdout=capsys.readouterr().out)
 
 
-@pytest.fixture
-def schema_file(tmp_path, test_schema_simple):
-    """Create a temporary schema file"""
-    schema_path = tmp_path / "schema.json"
-    with open(schema_path, 'w') as f:
-        json.dump(test_schema_simple, f)
-    return str(schema_path)
+def count_files(path, suffix):
+    """Count files in a directory whose names end with suffix"""
+    with os.scandir(path) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(suffix))
 
 
 # ================ Console Mode Tests ================
 
-def test_console_mode_basic(capsys):
-    """Test basic console output mode"""
+def test_console_mode_basic():
+    """Test basic console output mode (through a real `python3 -m dataforge`)"""
     result = subprocess.run(
         [
-            'python3', '-m', 'dataforge', '.',
+            *MODULE_COMMAND, '.',
             '--files_count=0',
             '--data_lines=3',
-            '--data_schema={"id":"int:rand","name":"str:rand"}'
+            SCHEMA_SIMPLE_ARG
         ],
-        capture_output=True,
-        text=True
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
     )
     
     assert result.returncode == 0
     
-    # Check that JSON data was output
-    lines = [line for line in result.stdout.split('\n') if line.strip() and line.startswith('{')]
+    # Check that JSON data was output (json.loads takes the bytes as-is)
+    lines = [line for line in result.stdout.splitlines() if line.startswith(b'{')]
     assert len(lines) == 3
     
     # Verify each line is valid JSON
@@ -76,15 +73,12 @@ def test_console_mode_basic(capsys):
 
 def test_console_mode_different_schema(capsys):
     """Test console mode with different schema"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', '.',
-            '--files_count=0',
-            '--data_lines=2',
-            '--data_schema={"timestamp":"timestamp:","status":"str:[active,inactive]"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        '.',
+        '--files_count=0',
+        '--data_lines=2',
+        '--data_schema={"timestamp":"timestamp:","status":"str:[active,inactive]"}'
     )
     
     assert result.returncode == 0
@@ -101,19 +95,16 @@ def test_console_mode_different_schema(capsys):
 
 # ================ File Mode Tests ================
 
-def test_file_mode_single_file(tmp_path):
+def test_file_mode_single_file(tmp_path, capsys, read_jsonl):
     """Test creating a single file"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=1',
-            '--file_name=test',
-            '--data_lines=10',
-            '--file_prefix=count',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=1',
+        '--file_name=test',
+        '--data_lines=10',
+        '--file_prefix=count',
+        SCHEMA_ID_ARG
     )
     
     assert result.returncode == 0
@@ -122,150 +113,94 @@ def test_file_mode_single_file(tmp_path):
     files = list(tmp_path.glob('*_test.json'))
     assert len(files) == 1
     
-    # Check file content
-    with open(files[0], 'r') as f:
-        lines = f.readlines()
-    assert len(lines) == 10
+    # Check file content and JSON validity
+    records = read_jsonl(files[0])
+    assert len(records) == 10
     
-    # Verify JSON validity
-    for line in lines:
-        data = json.loads(line.strip())
+    for data in records:
         assert 'id' in data
 
 
-def test_file_mode_multiple_files(tmp_path):
-    """Test creating multiple files"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=5',
-            '--file_name=data',
-            '--data_lines=20',
-            '--file_prefix=count',
-            '--data_schema={"id":"int:rand","name":"str:rand"}'
-        ],
-        capture_output=True,
-        text=True
+@pytest.mark.parametrize("prefix", ['count', 'random', 'uuid'])
+def test_file_mode_prefixes(tmp_path, capsys, prefix):
+    """Test creating multiple files with each prefix type"""
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=3',
+        f'--file_name={prefix}',
+        '--data_lines=5',
+        f'--file_prefix={prefix}',
+        SCHEMA_SIMPLE_ARG
     )
     
     assert result.returncode == 0
     
-    # Check files were created
-    files = sorted(tmp_path.glob('*_data.json'))
-    assert len(files) == 5
-    
-    # Check each file
-    for i, filepath in enumerate(files, 1):
-        # Check filename
-        assert f'{i}_data.json' in str(filepath)
-        
-        # Check content
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        assert len(lines) == 20
-
-
-def test_file_mode_random_prefix(tmp_path):
-    """Test file generation with random prefix"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=3',
-            '--file_name=random',
-            '--data_lines=5',
-            '--file_prefix=random',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
-    )
-    
-    assert result.returncode == 0
-    
-    files = list(tmp_path.glob('*_random.json'))
+    # Check files were created, each with all its lines
+    suffix = f'_{prefix}.json'
+    files = list(tmp_path.glob(f'*{suffix}'))
     assert len(files) == 3
     
-    # Check that prefixes are different
-    prefixes = [f.name.split('_')[0] for f in files]
-    assert len(set(prefixes)) == 3  # All unique
-
-
-def test_file_mode_uuid_prefix(tmp_path):
-    """Test file generation with UUID prefix"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=2',
-            '--file_name=uuid',
-            '--data_lines=10',
-            '--file_prefix=uuid',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
-    )
+    for filepath in files:
+        assert filepath.read_bytes().count(b'\n') == 5
     
-    assert result.returncode == 0
+    prefixes = [f.name[:-len(suffix)] for f in files]
     
-    files = list(tmp_path.glob('*_uuid.json'))
-    assert len(files) == 2
+    if prefix == 'count':
+        # Sequential indices from 1
+        assert sorted(map(int, prefixes)) == [1, 2, 3]
+    else:
+        assert len(set(prefixes)) == 3  # All unique
     
-    # Check UUID format (contains dashes)
-    for f in files:
-        assert '-' in f.name
+    if prefix == 'uuid':
+        # UUID format (8-4-4-4-12)
+        assert all(len(p.split('-')) == 5 for p in prefixes)
 
 
 # ================ Clear Path Tests ================
 
-def test_clear_path_functionality(tmp_path):
+def test_clear_path_functionality(tmp_path, capsys):
     """Test clear_path removes existing files"""
     # Create some existing files
+    old_content = b'{"old": true}'
     for i in range(3):
         filepath = tmp_path / f'{i}_old.json'
-        filepath.write_text('{"old": true}')
+        filepath.write_bytes(old_content)
     
     # Generate new files with clear_path
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=2',
-            '--file_name=new',
-            '--data_lines=5',
-            '--file_prefix=count',
-            '--clear_path',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=2',
+        '--file_name=new',
+        '--data_lines=5',
+        '--file_prefix=count',
+        '--clear_path',
+        SCHEMA_ID_ARG
     )
     
     assert result.returncode == 0
     
     # Old files should be gone
-    old_files = list(tmp_path.glob('*_old.json'))
-    assert len(old_files) == 0
+    assert count_files(tmp_path, '_old.json') == 0
     
     # New files should exist
-    new_files = list(tmp_path.glob('*_new.json'))
-    assert len(new_files) == 2
+    assert count_files(tmp_path, '_new.json') == 2
 
 
 # ================ Multiprocessing Tests ================
 
-def test_multiprocessing_mode(tmp_path):
+def test_multiprocessing_mode(tmp_path, capsys):
     """Test parallel file generation"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=10',
-            '--file_name=parallel',
-            '--data_lines=50',
-            '--file_prefix=count',
-            '--multiprocessing=4',
-            '--data_schema={"id":"int:rand","name":"str:rand"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=10',
+        '--file_name=parallel',
+        '--data_lines=50',
+        '--file_prefix=count',
+        '--multiprocessing=4',
+        SCHEMA_SIMPLE_ARG
     )
     
     assert result.returncode == 0
@@ -276,25 +211,20 @@ def test_multiprocessing_mode(tmp_path):
     
     # Check each file has correct number of lines
     for filepath in files:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        assert len(lines) == 50
+        assert filepath.read_bytes().count(b'\n') == 50
 
 
-def test_multiprocessing_sequential_indices(tmp_path):
+def test_multiprocessing_sequential_indices(tmp_path, capsys):
     """Test that multiprocessing creates files with sequential indices"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=8',
-            '--file_name=test',
-            '--data_lines=10',
-            '--file_prefix=count',
-            '--multiprocessing=3',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=8',
+        '--file_name=test',
+        '--data_lines=10',
+        '--file_prefix=count',
+        '--multiprocessing=3',
+        SCHEMA_ID_ARG
     )
     
     assert result.returncode == 0
@@ -312,19 +242,16 @@ def test_multiprocessing_sequential_indices(tmp_path):
 
 # ================ Schema Tests ================
 
-def test_schema_from_file(tmp_path, schema_file):
+def test_schema_from_file(tmp_path, schema_file, capsys, read_jsonl):
     """Test loading schema from file"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=1',
-            '--file_name=fromfile',
-            '--data_lines=5',
-            '--file_prefix=count',
-            f'--data_schema={schema_file}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=1',
+        '--file_name=fromfile',
+        '--data_lines=5',
+        '--file_prefix=count',
+        f'--data_schema={schema_file}'
     )
     
     assert result.returncode == 0
@@ -333,28 +260,23 @@ def test_schema_from_file(tmp_path, schema_file):
     assert len(files) == 1
     
     # Verify content matches schema
-    with open(files[0], 'r') as f:
-        for line in f:
-            data = json.loads(line.strip())
-            assert 'id' in data
-            assert 'name' in data
+    for data in read_jsonl(files[0]):
+        assert 'id' in data
+        assert 'name' in data
 
 
-def test_complex_schema(tmp_path, test_schema_complex):
+def test_complex_schema(tmp_path, test_schema_complex, capsys, read_jsonl):
     """Test with complex schema containing all field types"""
     schema_str = json.dumps(test_schema_complex)
     
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=2',
-            '--file_name=complex',
-            '--data_lines=10',
-            '--file_prefix=count',
-            f'--data_schema={schema_str}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=2',
+        '--file_name=complex',
+        '--data_lines=10',
+        '--file_prefix=count',
+        f'--data_schema={schema_str}'
     )
     
     assert result.returncode == 0
@@ -363,79 +285,67 @@ def test_complex_schema(tmp_path, test_schema_complex):
     assert len(files) == 2
     
     # Verify all fields are present and correct types
-    with open(files[0], 'r') as f:
-        for line in f:
-            data = json.loads(line.strip())
-            
-            # Check all fields exist
-            assert 'id' in data
-            assert 'timestamp' in data
-            assert 'username' in data
-            assert 'age' in data
-            assert 'status' in data
-            assert 'priority' in data
-            assert 'email' in data
-            assert 'count' in data
-            assert 'description' in data
-            
-            # Check types and ranges
-            assert isinstance(data['id'], int)
-            assert isinstance(data['timestamp'], float)
-            assert isinstance(data['username'], str)
-            assert 18 <= data['age'] <= 65
-            assert data['status'] in ['active', 'inactive', 'pending']
-            assert data['priority'] in [1, 2, 3, 4, 5]
-            assert data['email'] == 'test@example.com'
-            assert data['count'] == 100
-            assert data['description'] == ''
+    for data in read_jsonl(files[0]):
+        # Check all fields exist
+        assert 'id' in data
+        assert 'timestamp' in data
+        assert 'username' in data
+        assert 'age' in data
+        assert 'status' in data
+        assert 'priority' in data
+        assert 'email' in data
+        assert 'count' in data
+        assert 'description' in data
+        
+        # Check types and ranges
+        assert isinstance(data['id'], int)
+        assert isinstance(data['timestamp'], float)
+        assert isinstance(data['username'], str)
+        assert 18 <= data['age'] <= 65
+        assert data['status'] in ['active', 'inactive', 'pending']
+        assert data['priority'] in [1, 2, 3, 4, 5]
+        assert data['email'] == 'test@example.com'
+        assert data['count'] == 100
+        assert data['description'] == ''
 
 
 # ================ Error Handling Tests ================
 
-def test_invalid_files_count():
+def test_invalid_files_count(capsys):
     """Test that invalid files_count is rejected"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', '.',
-            '--files_count=-5',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        '.',
+        '--files_count=-5',
+        SCHEMA_ID_ARG
     )
     
     assert result.returncode == 1
     assert 'files_count must be >= 0' in result.stdout
 
 
-def test_invalid_data_lines():
+def test_invalid_data_lines(capsys):
     """Test that invalid data_lines is rejected"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', '.',
-            '--files_count=0',
-            '--data_lines=0',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        '.',
+        '--files_count=0',
+        '--data_lines=0',
+        SCHEMA_ID_ARG
     )
     
     assert result.returncode == 1
     assert 'data_lines must be > 0' in result.stdout
 
 
-def test_invalid_schema():
+def test_invalid_schema(capsys):
     """Test that invalid schema is rejected"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', '.',
-            '--files_count=0',
-            '--data_lines=1',
-            '--data_schema=invalid json'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        '.',
+        '--files_count=0',
+        '--data_lines=1',
+        '--data_schema=invalid json'
     )
     
     assert result.returncode == 1
@@ -443,21 +353,19 @@ def test_invalid_schema():
 
 # ================ Performance Tests ================
 
-def test_large_batch_generation(tmp_path):
+@pytest.mark.slow
+@pytest.mark.serial
+def test_large_batch_generation(tmp_path, capsys):
     """Test generating a large batch of files"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=20',
-            '--file_name=batch',
-            '--data_lines=100',
-            '--file_prefix=count',
-            '--multiprocessing=4',
-            '--data_schema={"id":"int:rand","name":"str:rand","timestamp":"timestamp:"}'
-        ],
-        capture_output=True,
-        text=True,
-        timeout=30  # 30 second timeout
+    result = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=20',
+        '--file_name=batch',
+        '--data_lines=100',
+        '--file_prefix=count',
+        '--multiprocessing=4',
+        '--data_schema={"id":"int:rand","name":"str:rand","timestamp":"timestamp:"}'
     )
     
     assert result.returncode == 0
@@ -466,27 +374,21 @@ def test_large_batch_generation(tmp_path):
     assert len(files) == 20
     
     # Verify total lines
-    total_lines = 0
-    for filepath in files:
-        with open(filepath, 'r') as f:
-            total_lines += len(f.readlines())
+    total_lines = sum(filepath.read_bytes().count(b'\n') for filepath in files)
     
     assert total_lines == 2000  # 20 files * 100 lines
 
 
 # ================ Configuration Tests ================
 
-def test_default_configuration():
+def test_default_configuration(capsys):
     """Test that default configuration is loaded"""
-    result = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', '.',
-            '--files_count=0',
-            '--data_lines=1',
-            '--data_schema={"id":"int:rand"}'
-        ],
-        capture_output=True,
-        text=True
+    result = run_cli(
+        capsys,
+        '.',
+        '--files_count=0',
+        '--data_lines=1',
+        SCHEMA_ID_ARG
     )
     
     assert result.returncode == 0
@@ -495,40 +397,33 @@ def test_default_configuration():
 
 # ================ Full Workflow Test ================
 
-def test_complete_workflow(tmp_path):
+def test_complete_workflow(tmp_path, capsys):
     """Test complete workflow from start to finish"""
     # Step 1: Create initial batch
-    result1 = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=5',
-            '--file_name=workflow',
-            '--data_lines=20',
-            '--file_prefix=count',
-            '--data_schema={"id":"int:rand","name":"str:rand","status":"str:[active,inactive]"}'
-        ],
-        capture_output=True,
-        text=True
+    result1 = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=5',
+        '--file_name=workflow',
+        '--data_lines=20',
+        '--file_prefix=count',
+        '--data_schema={"id":"int:rand","name":"str:rand","status":"str:[active,inactive]"}'
     )
     
     assert result1.returncode == 0
-    files1 = list(tmp_path.glob('*_workflow.json'))
-    assert len(files1) == 5
+    assert count_files(tmp_path, '_workflow.json') == 5
     
     # Step 2: Clear and create new batch with multiprocessing
-    result2 = subprocess.run(
-        [
-            'python3', '-m', 'dataforge', str(tmp_path),
-            '--files_count=10',
-            '--file_name=workflow',
-            '--data_lines=50',
-            '--file_prefix=random',
-            '--multiprocessing=3',
-            '--clear_path',
-            '--data_schema={"id":"int:rand","timestamp":"timestamp:","value":"int:rand(1,100)"}'
-        ],
-        capture_output=True,
-        text=True
+    result2 = run_cli(
+        capsys,
+        str(tmp_path),
+        '--files_count=10',
+        '--file_name=workflow',
+        '--data_lines=50',
+        '--file_prefix=random',
+        '--multiprocessing=3',
+        '--clear_path',
+        '--data_schema={"id":"int:rand","timestamp":"timestamp:","value":"int:rand(1,100)"}'
     )
     
     assert result2.returncode == 0
@@ -537,12 +432,11 @@ def test_complete_workflow(tmp_path):
     
     # Verify new files have correct structure
     for filepath in files2:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        assert len(lines) == 50
+        content = filepath.read_bytes()
+        assert content.count(b'\n') == 50
         
         # Check first line structure
-        data = json.loads(lines[0].strip())
+        data = json.loads(content[:content.index(b'\n')])
         assert 'id' in data
         assert 'timestamp' in data
         assert 'value' in data
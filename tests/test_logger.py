@@ -12,10 +12,38 @@ from dataforge.logger import (
     log_completion,
     log_error_and_exit,
     log_progress,
+    progress_interval,
     get_logger
 )
 
 
+# Format for captured output; the tests only check message text
+CAPTURE_FORMATTER = logging.Formatter('%(message)s')
+
+
+# ================ Fixtures ================
+
+@pytest.fixture(scope="module")
+def base_logger():
+    """Logger writing to an in-memory stream, configured once per module"""
+    logger = setup_logger(name='test_capture')
+    stream = StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(CAPTURE_FORMATTER)
+    logger.handlers = [handler]
+    return logger, stream
+
+
+@pytest.fixture
+def capture_stream(base_logger):
+    """Clear the captured stream and reset the level; returns (logger, stream)"""
+    logger, stream = base_logger
+    stream.seek(0)
+    stream.truncate()
+    logger.setLevel(logging.INFO)
+    return logger, stream
+
+
 def test_setup_logger():
     """Test basic logger setup"""
     logger = setup_logger(name='test_logger', level=logging.INFO)
@@ -40,8 +68,28 @@ def test_setup_logger_with_file(tmp_path):
     
     # Check if file was created and contains message
     assert log_file.exists()
-    content = log_file.read_text()
-    assert "Test message" in content
+    assert b"Test message" in log_file.read_bytes()
+
+
+@pytest.mark.parametrize("env_value, fast, expected", [
+    (None, None, "20"),   # default format starts with the date
+    ('1', None, "INFO - Fast message"),
+    (None, True, "INFO - Fast message"),
+    ('1', False, "20"),
+])
+def test_setup_logger_fast_format(tmp_path, monkeypatch, env_value, fast, expected):
+    """Test selecting the format without timestamps"""
+    if env_value is None:
+        monkeypatch.delenv('DATAFORGE_FAST_LOG', raising=False)
+    else:
+        monkeypatch.setenv('DATAFORGE_FAST_LOG', env_value)
+    log_file = tmp_path / "fast.log"
+    
+    logger = setup_logger(name='test_fast', log_file=str(log_file), fast=fast)
+    logger.info("Fast message")
+    
+    assert log_file.read_bytes().startswith(expected.encode())
+    assert logger.propagate is False
 
 
 def test_setup_logger_with_invalid_file():
@@ -51,14 +99,9 @@ def test_setup_logger_with_invalid_file():
     assert logger is not None
 
 
-def test_log_start():
+def test_log_start(capture_stream):
     """Test log_start function"""
-    logger = setup_logger(name='test_start')
-    
-    # Capture output
-    stream = StringIO()
-    handler = logging.StreamHandler(stream)
-    logger.handlers = [handler]
+    logger, stream = capture_stream
     
     log_start(logger, "Test start message")
     
@@ -67,13 +110,9 @@ def test_log_start():
     assert "=" in output
 
 
-def test_log_completion():
+def test_log_completion(capture_stream):
     """Test log_completion function"""
-    logger = setup_logger(name='test_completion')
-    
-    stream = StringIO()
-    handler = logging.StreamHandler(stream)
-    logger.handlers = [handler]
+    logger, stream = capture_stream
     
     details = {'files': 10, 'lines': 1000}
     log_completion(logger, "Test completion", details)
@@ -84,24 +123,21 @@ def test_log_completion():
     assert "lines: 1000" in output
 
 
-def test_log_error_and_exit():
+def test_log_error_and_exit(capture_stream):
     """Test log_error_and_exit function"""
-    logger = setup_logger(name='test_error')
+    logger, stream = capture_stream
     
     # Should exit with code 1
     with pytest.raises(SystemExit) as exc_info:
         log_error_and_exit(logger, "Test error message", exit_code=1)
     
     assert exc_info.value.code == 1
+    assert "Test error message" in stream.getvalue()
 
 
-def test_log_progress():
+def test_log_progress(capture_stream):
     """Test log_progress function"""
-    logger = setup_logger(name='test_progress')
-    
-    stream = StringIO()
-    handler = logging.StreamHandler(stream)
-    logger.handlers = [handler]
+    logger, stream = capture_stream
     
     log_progress(logger, 50, 100, "files")
     
@@ -111,13 +147,9 @@ def test_log_progress():
     assert "files" in output
 
 
-def test_log_progress_zero_total():
+def test_log_progress_zero_total(capture_stream):
     """Test log_progress with zero total"""
-    logger = setup_logger(name='test_progress_zero')
-    
-    stream = StringIO()
-    handler = logging.StreamHandler(stream)
-    logger.handlers = [handler]
+    logger, stream = capture_stream
     
     # Should not crash with zero division
     log_progress(logger, 0, 0, "items")
@@ -126,6 +158,18 @@ def test_log_progress_zero_total():
     assert "0/0" in output
 
 
+@pytest.mark.parametrize("total,expected", [
+    (0, 1),
+    (3, 1),
+    (10, 1),
+    (25, 2),
+    (1000, 100),
+])
+def test_progress_interval(total, expected):
+    """Test progress logging interval calculation"""
+    assert progress_interval(total) == expected
+
+
 def test_get_logger():
     """Test get_logger function"""
     logger1 = get_logger()
@@ -136,13 +180,10 @@ def test_get_logger():
     assert logger1.name == 'dataforge'
 
 
-def test_logger_different_levels():
+def test_logger_different_levels(capture_stream):
     """Test logger with different log levels"""
-    logger = setup_logger(name='test_levels', level=logging.WARNING)
-    
-    stream = StringIO()
-    handler = logging.StreamHandler(stream)
-    logger.handlers = [handler]
+    logger, stream = capture_stream
+    logger.setLevel(logging.WARNING)
     
     logger.info("Info message")
     logger.warning("Warning message")
@@ -4,19 +4,35 @@ Tests for multiprocessor module
 
 import pytest
 import os
+import re
 import json
 from dataforge.multiprocessor import (
     distribute_work,
     worker_function,
+    init_worker,
+    run_task,
     generate_files_parallel,
+    create_pool,
     should_use_multiprocessing
 )
 from dataforge.data_generator import create_generator
 
 
+# File counts for the parallel generation tests; small enough to keep
+# the suite fast while still spreading files across several workers
+SMALL = 3
+MED = 6
+
+# Worker count for the tests that do not depend on a specific one
+WORKERS = 2
+
+# Index prefix of a 'count' file name at the end of a path
+INDEX_PATTERN = re.compile(r'(\d+)_[^/\\]*$')
+
+
 # ================ Fixtures ================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def simple_schema():
     """Simple schema for testing"""
     return {
@@ -25,12 +41,30 @@ def simple_schema():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_generator(simple_schema):
     """Create a simple generator for testing"""
     return create_generator(simple_schema)
 
 
+# ================ Helpers ================
+
+def verify_jsonl(path, expected_lines, required_keys=('id', 'name')):
+    """Check line count and required keys of a JSON Lines file in one read"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    
+    assert content.count(b'\n') == expected_lines
+    for line in content.splitlines():
+        data = json.loads(line)
+        assert data.keys() >= set(required_keys)
+
+
+def extract_indices(paths):
+    """Return the count prefixes of the given file paths"""
+    return [int(INDEX_PATTERN.search(path).group(1)) for path in paths]
+
+
 # ================ distribute_work tests ================
 
 @pytest.mark.parametrize("total_files,num_processes,expected", [
@@ -41,6 +75,8 @@ def test_generator(simple_schema):
     (10, 1, [10]),             # 10 files, 1 process: all
     (1, 1, [1]),               # 1 file, 1 process
     (15, 4, [4, 4, 4, 3]),     # 15 files, 4 processes: 4+4+4+3
+    (100, 7, [15, 15, 14, 14, 14, 14, 14]),  # 100 files, 7 processes
+    (20, 7, [3, 3, 3, 3, 3, 3, 2]),          # 20 files, 7 processes
 ])
 def test_distribute_work(total_files, num_processes, expected):
     """Test work distribution across processes"""
@@ -49,27 +85,9 @@ def test_distribute_work(total_files, num_processes, expected):
     assert distribution == expected
     assert sum(distribution) == total_files
     assert len(distribution) == num_processes
-
-
-def test_distribute_work_sum_equals_total():
-    """Test that distribution sums to total files"""
-    total_files = 100
-    num_processes = 7
     
-    distribution = distribute_work(total_files, num_processes)
-    
-    assert sum(distribution) == total_files
-    assert len(distribution) == num_processes
-
-
-def test_distribute_work_balanced():
-    """Test that distribution is balanced (difference <= 1)"""
-    distribution = distribute_work(20, 7)
-    
-    # Maximum difference should be 1
-    max_val = max(distribution)
-    min_val = min(distribution)
-    assert max_val - min_val <= 1
+    # Balanced: maximum difference should be 1
+    assert max(distribution) - min(distribution) <= 1
 
 
 # ================ worker_function tests ================
@@ -116,11 +134,7 @@ def test_worker_function_correct_data_lines(tmp_path, simple_schema):
     
     files = worker_function(args)
     
-    # Check line count
-    with open(files[0], 'r') as f:
-        lines = f.readlines()
-    
-    assert len(lines) == 10
+    verify_jsonl(files[0], 10)
 
 
 def test_worker_function_start_index(tmp_path, simple_schema):
@@ -163,15 +177,55 @@ def test_worker_function_valid_json(tmp_path, simple_schema):
     files = worker_function(args)
     
     # Read and validate JSON
-    with open(files[0], 'r') as f:
+    with open(files[0], 'rb') as f:
         for line in f:
-            data = json.loads(line.strip())
+            data = json.loads(line)
             assert 'id' in data
             assert 'name' in data
             assert isinstance(data['id'], int)
             assert isinstance(data['name'], str)
 
 
+def test_run_task_uses_initialized_params(tmp_path, simple_schema):
+    """Test that run_task creates files from the parameters set by init_worker"""
+    init_worker({
+        'path': str(tmp_path),
+        'file_name': 'task',
+        'prefix_type': 'count',
+        'data_lines': 4,
+        'parsed_schema': simple_schema
+    })
+    
+    files = run_task((1, 5, 2))
+    
+    assert [os.path.basename(f) for f in files] == ['5_task.json', '6_task.json']
+    verify_jsonl(files[0], 4)
+
+
+def test_init_worker_builds_generator_once(tmp_path, simple_schema, monkeypatch):
+    """Test that tasks reuse the generator built by init_worker"""
+    calls = []
+    
+    def counting_create_generator(schema):
+        calls.append(schema)
+        return create_generator(schema)
+    
+    monkeypatch.setattr('dataforge.multiprocessor.create_generator', counting_create_generator)
+    
+    init_worker({
+        'path': str(tmp_path),
+        'file_name': 'task',
+        'prefix_type': 'count',
+        'data_lines': 2,
+        'parsed_schema': simple_schema
+    })
+    run_task((1, 1, 2))
+    run_task((2, 3, 2))
+    
+    assert len(calls) == 1
+    assert len(os.listdir(tmp_path)) == 4
+
+
 # ================ generate_files_parallel tests ================
 
 def test_generate_files_parallel_basic(tmp_path, simple_schema):
@@ -180,15 +234,15 @@ def test_generate_files_parallel_basic(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'data',
         'prefix_type': 'count',
-        'files_count': 6,
-        'data_lines': 10,
-        'multiprocessing': 2,
+        'files_count': MED,
+        'data_lines': 2,
+        'multiprocessing': WORKERS,
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    assert len(files) == 6
+    assert len(files) == MED
     assert all(os.path.exists(f) for f in files)
 
 
@@ -198,15 +252,15 @@ def test_generate_files_parallel_correct_count(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'test',
         'prefix_type': 'count',
-        'files_count': 10,
-        'data_lines': 5,
-        'multiprocessing': 4,
+        'files_count': MED,
+        'data_lines': 2,
+        'multiprocessing': WORKERS,
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    assert len(files) == 10
+    assert len(files) == MED
 
 
 def test_generate_files_parallel_single_process(tmp_path, simple_schema):
@@ -215,15 +269,15 @@ def test_generate_files_parallel_single_process(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'data',
         'prefix_type': 'count',
-        'files_count': 5,
-        'data_lines': 10,
+        'files_count': SMALL,
+        'data_lines': 2,
         'multiprocessing': 1,
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    assert len(files) == 5
+    assert len(files) == SMALL
 
 
 def test_generate_files_parallel_many_processes(tmp_path, simple_schema):
@@ -232,15 +286,15 @@ def test_generate_files_parallel_many_processes(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'data',
         'prefix_type': 'count',
-        'files_count': 3,
-        'data_lines': 5,
+        'files_count': SMALL,
+        'data_lines': 2,
         'multiprocessing': 5,  # More processes than files
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    assert len(files) == 3
+    assert len(files) == SMALL
 
 
 def test_generate_files_parallel_data_correctness(tmp_path, simple_schema):
@@ -249,27 +303,17 @@ def test_generate_files_parallel_data_correctness(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'test',
         'prefix_type': 'count',
-        'files_count': 4,
-        'data_lines': 10,
-        'multiprocessing': 2,
+        'files_count': SMALL,
+        'data_lines': 4,
+        'multiprocessing': WORKERS,
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    # Check each file
+    # Each file should have 4 lines of valid JSON
     for filepath in files:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        
-        # Each file should have 10 lines
-        assert len(lines) == 10
-        
-        # Each line should be valid JSON
-        for line in lines:
-            data = json.loads(line.strip())
-            assert 'id' in data
-            assert 'name' in data
+        verify_jsonl(filepath, 4)
 
 
 def test_generate_files_parallel_file_indices(tmp_path, simple_schema):
@@ -278,24 +322,33 @@ def test_generate_files_parallel_file_indices(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'data',
         'prefix_type': 'count',
-        'files_count': 10,
-        'data_lines': 5,
-        'multiprocessing': 3,
+        'files_count': MED + 1,
+        'data_lines': 2,
+        'multiprocessing': WORKERS,
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    # Extract indices from filenames
-    indices = []
-    for filepath in files:
-        filename = os.path.basename(filepath)
-        index = int(filename.split('_')[0])
-        indices.append(index)
+    # Indices should be 1 to MED + 1
+    assert sorted(extract_indices(files)) == list(range(1, MED + 2))
+
+
+def test_generate_files_parallel_preserves_order(tmp_path, simple_schema):
+    """Test that files are returned in index order regardless of completion order"""
+    params = {
+        'path': str(tmp_path),
+        'file_name': 'data',
+        'prefix_type': 'count',
+        'files_count': MED * 2,
+        'data_lines': 1,
+        'multiprocessing': WORKERS,
+        'parsed_schema': simple_schema
+    }
     
-    # Indices should be 1 to 10
-    indices.sort()
-    assert indices == list(range(1, 11))
+    files = generate_files_parallel(params)
+    
+    assert extract_indices(files) == list(range(1, MED * 2 + 1))
 
 
 def test_generate_files_parallel_random_prefix(tmp_path, simple_schema):
@@ -304,19 +357,19 @@ def test_generate_files_parallel_random_prefix(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'data',
         'prefix_type': 'random',
-        'files_count': 5,
-        'data_lines': 10,
-        'multiprocessing': 2,
+        'files_count': MED,
+        'data_lines': 2,
+        'multiprocessing': WORKERS,
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    assert len(files) == 5
+    assert len(files) == MED
     
     # All file names should be unique
     basenames = [os.path.basename(f) for f in files]
-    assert len(set(basenames)) == 5
+    assert len(set(basenames)) == MED
 
 
 def test_generate_files_parallel_uuid_prefix(tmp_path, simple_schema):
@@ -325,15 +378,15 @@ def test_generate_files_parallel_uuid_prefix(tmp_path, simple_schema):
         'path': str(tmp_path),
         'file_name': 'test',
         'prefix_type': 'uuid',
-        'files_count': 3,
-        'data_lines': 5,
-        'multiprocessing': 2,
+        'files_count': SMALL,
+        'data_lines': 2,
+        'multiprocessing': WORKERS,
         'parsed_schema': simple_schema
     }
     
     files = generate_files_parallel(params)
     
-    assert len(files) == 3
+    assert len(files) == SMALL
     
     # Check UUID format in filenames
     for filepath in files:
@@ -342,6 +395,74 @@ def test_generate_files_parallel_uuid_prefix(tmp_path, simple_schema):
         assert '-' in basename  # UUIDs have dashes
 
 
+def test_generate_files_parallel_relative_path(tmp_path, monkeypatch, simple_schema):
+    """Test that a relative path is resolved against the caller's current directory"""
+    params = {
+        'path': '.',
+        'file_name': 'data',
+        'prefix_type': 'count',
+        'files_count': SMALL,
+        'data_lines': 1,
+        'multiprocessing': WORKERS,
+        'parsed_schema': simple_schema
+    }
+    
+    for name in ('first', 'second'):
+        run_dir = tmp_path / name
+        run_dir.mkdir()
+        monkeypatch.chdir(run_dir)
+        
+        files = generate_files_parallel(params)
+        
+        assert all(os.path.dirname(f) == str(run_dir) for f in files)
+        assert len(os.listdir(run_dir)) == SMALL
+
+
+def test_generate_files_parallel_workers_after_parent_cached(tmp_path, simple_schema):
+    """Test that workers forked after the parent cached the schema draw different data"""
+    # Cache the generator in the parent before the workers are forked
+    create_generator(simple_schema)
+    
+    params = {
+        'path': str(tmp_path),
+        'file_name': 'data',
+        'prefix_type': 'count',
+        'files_count': 8,
+        'data_lines': 5,
+        'multiprocessing': 4,
+        'parsed_schema': simple_schema
+    }
+    
+    files = generate_files_parallel(params)
+    
+    contents = set()
+    for filepath in files:
+        with open(filepath, 'rb') as f:
+            contents.add(f.read())
+    assert len(contents) == 8
+
+
+def test_generate_files_parallel_caller_pool(tmp_path, simple_schema):
+    """Test that a caller-supplied pool is used and left running"""
+    params = {
+        'path': str(tmp_path),
+        'file_name': 'data',
+        'prefix_type': 'count',
+        'files_count': SMALL,
+        'data_lines': 2,
+        'multiprocessing': WORKERS,
+        'parsed_schema': simple_schema
+    }
+    
+    with create_pool(params) as pool:
+        first = generate_files_parallel(params, pool=pool)
+        second = generate_files_parallel(params, pool=pool)
+    
+    assert first == second
+    assert len(os.listdir(tmp_path)) == SMALL
+    verify_jsonl(first[0], 2)
+
+
 # ================ should_use_multiprocessing tests ================
 
 @pytest.mark.parametrize("files_count,multiprocessing,expected", [
@@ -360,13 +481,13 @@ def test_should_use_multiprocessing(files_count, multiprocessing, expected):
 
 # ================ Integration tests ================
 
-def test_full_multiprocessing_workflow(tmp_path, simple_schema):
+@pytest.mark.parametrize("total_files,num_processes,data_lines", [
+    (SMALL * 2, WORKERS, 2),
+    pytest.param(20, 4, 15, marks=pytest.mark.slow),  # Full-size run
+])
+def test_full_multiprocessing_workflow(tmp_path, simple_schema,
+                                       total_files, num_processes, data_lines):
     """Test complete multiprocessing workflow"""
-    # Test parameters
-    total_files = 20
-    num_processes = 4
-    data_lines = 15
-    
     params = {
         'path': str(tmp_path),
         'file_name': 'workflow_test',
@@ -386,27 +507,10 @@ def test_full_multiprocessing_workflow(tmp_path, simple_schema):
     # Verify all files exist
     assert all(os.path.exists(f) for f in files)
     
-    # Verify data in each file
+    # Verify line count and JSON in each file
     for filepath in files:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
-        
-        # Check line count
-        assert len(lines) == data_lines
-        
-        # Validate JSON
-        for line in lines:
-            data = json.loads(line.strip())
-            assert 'id' in data
-            assert 'name' in data
+        verify_jsonl(filepath, data_lines)
     
     # Verify file indices are sequential
-    indices = []
-    for filepath in files:
-        filename = os.path.basename(filepath)
-        index = int(filename.split('_')[0])
-        indices.append(index)
-    
-    indices.sort()
-    assert indices == list(range(1, total_files + 1))
+    assert sorted(extract_indices(files)) == list(range(1, total_files + 1))
 
@@ -3,7 +3,30 @@ Tests for schema_parser module
 """
 
 import pytest
-from dataforge.schema_parser import SchemaParser, parse_schema
+from dataforge.schema_parser import SchemaParser, SchemaError, parse_schema
+
+
+# ================ Fixtures ================
+
+@pytest.fixture(scope="module")
+def empty_parser():
+    """Parser used only to call its helper methods, which keep no state"""
+    return SchemaParser({})
+
+
+@pytest.fixture(scope="module")
+def parsed_complex():
+    """Complex schema with every field type, parsed once per module"""
+    return parse_schema({
+        "id": "int:rand",
+        "timestamp": "timestamp:",
+        "name": "str:rand",
+        "age": "int:rand(18,65)",
+        "status": "str:[active,inactive,pending]",
+        "priority": "int:[1,2,3,4,5]",
+        "email": "str:test@example.com",
+        "count": "int:100"
+    })
 
 
 # ================ Timestamp tests ================
@@ -135,20 +158,9 @@ def test_parse_int_list(definition, expected_list):
 
 # ================ Complex schema tests ================
 
-def test_parse_complex_schema():
+def test_parse_complex_schema(parsed_complex):
     """Test parsing a complex schema with multiple field types"""
-    schema = {
-        "id": "int:rand",
-        "timestamp": "timestamp:",
-        "name": "str:rand",
-        "age": "int:rand(18,65)",
-        "status": "str:[active,inactive,pending]",
-        "priority": "int:[1,2,3,4,5]",
-        "email": "str:test@example.com",
-        "count": "int:100"
-    }
-    
-    parsed = parse_schema(schema)
+    parsed = parsed_complex
     
     # Check all fields are parsed
     assert len(parsed) == 8
@@ -193,118 +205,22 @@ def test_parse_complex_schema():
 
 # ================ Error handling tests ================
 
-def test_parse_invalid_type():
-    """Test that invalid type raises error"""
-    schema = {"field": "invalid_type:value"}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_missing_colon():
-    """Test that missing colon raises error"""
-    schema = {"field": "str_rand"}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_empty_schema():
-    """Test that empty schema raises error"""
-    schema = {}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_non_dict_schema():
-    """Test that non-dict schema raises error"""
-    parser = SchemaParser("not a dict")
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_non_string_definition():
-    """Test that non-string field definition raises error"""
-    schema = {"field": 123}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_int_empty_value():
-    """Test that int with empty value raises error"""
-    schema = {"count": "int:"}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_int_invalid_static_value():
-    """Test that int with invalid static value raises error"""
-    schema = {"count": "int:not_a_number"}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_int_list_with_non_integers():
-    """Test that int list with non-integers raises error"""
-    schema = {"priority": "int:[1,two,3]"}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_int_range_invalid_order():
-    """Test that int range with min >= max raises error"""
-    schema = {"age": "int:rand(65,18)"}  # min > max
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_int_range_equal_values():
-    """Test that int range with min == max raises error"""
-    schema = {"value": "int:rand(50,50)"}  # min == max
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_empty_list():
-    """Test that empty list raises error"""
-    schema = {"field": "str:[]"}
-    parser = SchemaParser(schema)
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser.parse()
-    assert exc_info.value.code == 1
-
-
-def test_parse_list_with_only_spaces():
-    """Test that list with only spaces raises error"""
-    schema = {"field": "str:[  ,  ,  ]"}
+@pytest.mark.parametrize("schema", [
+    pytest.param({"field": "invalid_type:value"}, id="invalid_type"),
+    pytest.param({"field": "str_rand"}, id="missing_colon"),
+    pytest.param({}, id="empty_schema"),
+    pytest.param("not a dict", id="non_dict_schema"),
+    pytest.param({"field": 123}, id="non_string_definition"),
+    pytest.param({"count": "int:"}, id="int_empty_value"),
+    pytest.param({"count": "int:not_a_number"}, id="int_invalid_static_value"),
+    pytest.param({"priority": "int:[1,two,3]"}, id="int_list_with_non_integers"),
+    pytest.param({"age": "int:rand(65,18)"}, id="int_range_invalid_order"),
+    pytest.param({"value": "int:rand(50,50)"}, id="int_range_equal_values"),
+    pytest.param({"field": "str:[]"}, id="empty_list"),
+    pytest.param({"field": "str:[  ,  ,  ]"}, id="list_with_only_spaces"),
+])
+def test_parse_invalid_schema(schema):
+    """Test that invalid schemas and field definitions raise error"""
     parser = SchemaParser(schema)
     
     with pytest.raises(SystemExit) as exc_info:
@@ -357,61 +273,74 @@ def test_parse_multiple_fields_with_errors():
         parser.parse()
 
 
+def test_parse_reports_all_invalid_fields(monkeypatch):
+    """Test that parse reports every invalid field before exiting"""
+    schema = {
+        "bad_type": "invalid_type:value",
+        "ok": "str:rand",
+        "bad_range": "int:rand(10,1)",
+        "bad_list": "int:[1,x]"
+    }
+    parser = SchemaParser(schema)
+    messages = []
+    monkeypatch.setattr(parser.logger, 'error', messages.append)
+    
+    with pytest.raises(SystemExit) as exc_info:
+        parser.parse()
+    
+    assert exc_info.value.code == 1
+    assert [m.split("'")[1] for m in messages[:3]] == ['bad_type', 'bad_range', 'bad_list']
+    assert messages[3] == "Schema has 3 invalid field(s)"
+
+
 # ================ SchemaParser class methods tests ================
 
-def test_split_type_value():
+def test_split_type_value(empty_parser):
     """Test _split_type_value method"""
-    parser = SchemaParser({})
-    
     # Normal case
-    data_type, value = parser._split_type_value("field", "str:rand")
+    data_type, value = empty_parser._split_type_value("field", "str:rand")
     assert data_type == "str"
     assert value == "rand"
     
     # Empty value
-    data_type, value = parser._split_type_value("field", "timestamp:")
+    data_type, value = empty_parser._split_type_value("field", "timestamp:")
     assert data_type == "timestamp"
     assert value == ""
     
     # Multiple colons
-    data_type, value = parser._split_type_value("field", "str:http://example.com")
+    data_type, value = empty_parser._split_type_value("field", "str:http://example.com")
     assert data_type == "str"
     assert value == "http://example.com"
 
 
-def test_validate_type_valid():
+def test_validate_type_valid(empty_parser):
     """Test _validate_type with valid types"""
-    parser = SchemaParser({})
-    
     # Should not raise
-    parser._validate_type("field", "timestamp")
-    parser._validate_type("field", "str")
-    parser._validate_type("field", "int")
+    empty_parser._validate_type("field", "timestamp")
+    empty_parser._validate_type("field", "str")
+    empty_parser._validate_type("field", "int")
 
 
-def test_validate_type_invalid():
+def test_validate_type_invalid(empty_parser):
     """Test _validate_type with invalid type"""
-    parser = SchemaParser({})
-    
-    with pytest.raises(SystemExit) as exc_info:
-        parser._validate_type("field", "invalid")
-    assert exc_info.value.code == 1
+    with pytest.raises(SchemaError) as exc_info:
+        empty_parser._validate_type("field", "invalid")
+    assert exc_info.value.field == "field"
+    assert exc_info.value.rule == "type"
 
 
-def test_parse_list_method():
+def test_parse_list_method(empty_parser):
     """Test _parse_list method"""
-    parser = SchemaParser({})
-    
     # Normal list
-    values = parser._parse_list("field", "[one,two,three]")
+    values = empty_parser._parse_list("field", "[one,two,three]")
     assert values == ['one', 'two', 'three']
     
     # With spaces
-    values = parser._parse_list("field", "[ one , two , three ]")
+    values = empty_parser._parse_list("field", "[ one , two , three ]")
     assert values == ['one', 'two', 'three']
     
     # Single value
-    values = parser._parse_list("field", "[single]")
+    values = empty_parser._parse_list("field", "[single]")
     assert values == ['single']
 
 
@@ -449,3 +378,15 @@ def test_schema_parser_reusable():
     assert 'field1' not in parsed2
     assert 'field2' not in parsed1
 
+
+
+def test_parse_schema_cached_copies():
+    """Test that repeated parse_schema calls return equal but independent results"""
+    schema = {"status": "str:[active,inactive]", "age": "int:rand(18,65)"}
+    
+    parsed1 = parse_schema(schema)
+    parsed1['status']['value'].append('deleted')
+    parsed2 = parse_schema(dict(schema))
+    
+    assert parsed2['status']['value'] == ['active', 'inactive']
+    assert list(parsed2) == ['status', 'age']
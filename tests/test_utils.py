@@ -15,11 +15,20 @@ from dataforge.utils import (
     validate_file_path,
     format_file_size,
     get_absolute_path,
-    count_lines_in_file
+    count_lines_in_file,
+    encode_json_line,
+    stat_path
 )
 from dataforge.logger import setup_logger
 
 
+# File contents for the load tests, encoded once at import
+TEST_DATA = {"name": "test", "value": 123}
+TEST_DATA_JSON = json.dumps(TEST_DATA).encode('utf-8')
+SCHEMA_DATA = {"name": "str:rand", "age": "int:rand"}
+SCHEMA_DATA_JSON = json.dumps(SCHEMA_DATA).encode('utf-8')
+
+
 def test_is_json_file_with_existing_file(tmp_path):
     """Test is_json_file with an existing JSON file"""
     json_file = tmp_path / "test.json"
@@ -46,16 +55,23 @@ def test_is_json_file_with_directory(tmp_path):
 def test_load_json_from_file(tmp_path):
     """Test loading JSON from valid file"""
     json_file = tmp_path / "data.json"
-    test_data = {"name": "test", "value": 123}
-    json_file.write_text(json.dumps(test_data))
+    json_file.write_bytes(TEST_DATA_JSON)
     
     data = load_json_from_file(str(json_file))
     
-    assert data == test_data
+    assert data == TEST_DATA
     assert data['name'] == 'test'
     assert data['value'] == 123
 
 
+def test_load_json_from_file_utf8_bom(tmp_path):
+    """Test loading a UTF-8 JSON file that starts with a BOM"""
+    json_file = tmp_path / "bom.json"
+    json_file.write_bytes(b'\xef\xbb\xbf' + '{"city": "Zürich"}'.encode('utf-8'))
+    
+    assert load_json_from_file(str(json_file)) == {"city": "Zürich"}
+
+
 def test_load_json_from_file_not_found():
     """Test loading JSON from non-existent file"""
     with pytest.raises(SystemExit) as exc_info:
@@ -96,12 +112,11 @@ def test_parse_json_string_invalid():
 def test_load_schema_from_file(tmp_path):
     """Test load_schema with file path"""
     schema_file = tmp_path / "schema.json"
-    schema_data = {"name": "str:rand", "age": "int:rand"}
-    schema_file.write_text(json.dumps(schema_data))
+    schema_file.write_bytes(SCHEMA_DATA_JSON)
     
     schema = load_schema(str(schema_file))
     
-    assert schema == schema_data
+    assert schema == SCHEMA_DATA
 
 
 def test_load_schema_from_string():
@@ -236,3 +251,22 @@ def test_is_json_file_with_path_separators():
     assert is_json_file('../data/schema.json') in [True, False]
     assert is_json_file('/absolute/path/schema.json') in [True, False]
 
+
+def test_encode_json_line_compact():
+    """Test that encode_json_line produces compact JSON with non-ASCII kept as-is"""
+    data = {'id': 1, 'name': 'Alice', 'score': 9.5, 'tag': None, 'city': 'Zürich'}
+    
+    line = encode_json_line(data)
+    
+    assert line == '{"id":1,"name":"Alice","score":9.5,"tag":null,"city":"Zürich"}'
+    assert json.loads(line) == data
+
+
+def test_stat_path(tmp_path):
+    """Test stat_path for files, directories and missing paths"""
+    file_path = tmp_path / "data.json"
+    file_path.write_text('{}')
+    
+    assert stat_path(str(file_path)).st_size == 2
+    assert stat_path(str(tmp_path)) is not None
+    assert stat_path(str(tmp_path / "missing")) is None
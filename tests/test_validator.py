@@ -14,6 +14,11 @@ from dataforge.validator import (
     validate_schema_basic,
     validate_all_parameters
 )
+from dataforge.logger import get_logger
+
+
+# CPUs available to the tests, read once
+CPU_COUNT = os.cpu_count() or 1
 
 
 # ================ validate_path tests ================
@@ -112,6 +117,18 @@ def test_validate_data_lines_not_integer():
         validate_data_lines(100.5)
 
 
+@pytest.mark.parametrize("validator", [
+    validate_files_count,
+    validate_data_lines,
+    validate_multiprocessing
+])
+def test_integer_validators_reject_bool(validator):
+    """Test that bools are not accepted as integers"""
+    with pytest.raises(SystemExit) as exc_info:
+        validator(True)
+    assert exc_info.value.code == 1
+
+
 # ================ validate_multiprocessing tests ================
 
 @pytest.mark.parametrize("mp_count,expected", [
@@ -123,12 +140,12 @@ def test_validate_multiprocessing_valid(mp_count, expected):
     """Test validation of valid multiprocessing values"""
     result = validate_multiprocessing(mp_count)
     assert result == expected
-    assert result <= os.cpu_count()
+    assert result <= CPU_COUNT
 
 
 def test_validate_multiprocessing_exceeds_cpu_count():
     """Test that multiprocessing is limited to cpu_count"""
-    cpu_count = os.cpu_count() or 1
+    cpu_count = CPU_COUNT
     very_large_value = cpu_count + 100
     
     result = validate_multiprocessing(very_large_value)
@@ -327,7 +344,7 @@ def test_validate_all_parameters_console_mode(tmp_path):
 
 def test_validate_all_parameters_multiprocessing_correction():
     """Test that multiprocessing is corrected if exceeds cpu_count"""
-    cpu_count = os.cpu_count() or 1
+    cpu_count = CPU_COUNT
     
     params = {
         'path_to_save_files': '.',
@@ -379,3 +396,26 @@ def test_validate_all_parameters_invalid_data_lines():
     with pytest.raises(SystemExit):
         validate_all_parameters(params)
 
+
+
+def test_validate_all_parameters_reports_all_errors(monkeypatch):
+    """Test that every invalid parameter is reported before exiting"""
+    params = {
+        'path_to_save_files': '.',
+        'files_count': 0,
+        'file_name': 'bad/name',  # Invalid
+        'file_prefix': 'nope',  # Invalid
+        'data_lines': 0,  # Invalid
+        'multiprocessing': 1,
+        'clear_path': False,
+        'data_schema': '{"id": "int:rand"}'
+    }
+    messages = []
+    monkeypatch.setattr(get_logger(), 'error', messages.append)
+    
+    with pytest.raises(SystemExit) as exc_info:
+        validate_all_parameters(params)
+    
+    assert exc_info.value.code == 1
+    assert len(messages) == 4
+    assert messages[-1] == "Invalid parameter(s): data_lines, file_name, file_prefix"